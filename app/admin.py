@@ -2,6 +2,7 @@
 from typing import Any
 
 from django.contrib import admin
+from django.http import HttpResponse
 
 from .models import (
     Student,
@@ -27,6 +28,8 @@ from .models import (
     ChatRoom,
     Template,
 )
+from .assignment import plan_assignments
+from .provisioning import credential_workbook, provision_credentials
 from project_lib.admin import ImportableExportableAdmin, Workbook, RecordImportError
 
 admin.site.register(CustomUser)
@@ -45,6 +48,51 @@ admin.site.register(Evaluation4CommitteeMember)
 admin.site.register(ChatRoom)
 
 
+@admin.action(description="Generate passwords and download credentials")
+def provision_user_credentials(modeladmin, request, queryset):
+    """
+    Gives the users of the selected profiles a fresh random password and
+    returns the credential sheet. Passwords are only shown in this sheet.
+    """
+    users = CustomUser.objects.select_related(*CustomUser.PROFILE_RELATIONS).filter(
+        pk__in=queryset.values("user_id")
+    )
+    credentials = provision_credentials(users.order_by("id"))
+
+    response = HttpResponse(
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+    response["Content-Disposition"] = "attachment; filename={}_credentials.xlsx".format(
+        modeladmin.model._meta.model_name
+    )
+    credential_workbook(credentials).save(response)
+    return response
+
+
+@admin.action(description="Download supervisor assignment plan (dry run)")
+def download_assignment_plan(modeladmin, request, queryset):
+    """
+    Plans supervisors for the unassigned accepted groups of the selected
+    categories and returns the plan without writing it.
+    """
+    response = HttpResponse(
+        content_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
+    )
+    response["Content-Disposition"] = "attachment; filename=assignment_plan.xlsx"
+    plan_assignments(queryset).workbook().save(response)
+    return response
+
+
+@admin.action(description="Assign supervisors to unassigned groups")
+def assign_supervisors(modeladmin, request, queryset):
+    plan = plan_assignments(queryset)
+    applied = plan.apply()
+    modeladmin.message_user(
+        request,
+        f"Assigned {applied} group(s); {len(plan.unassigned)} left unassigned",
+    )
+
+
 @admin.register(Project)
 class ProjectAdmin(admin.ModelAdmin):
     list_display = ["project_name", "project_category", "panel", "user"]
@@ -82,6 +130,7 @@ class TemplateAdmin(admin.ModelAdmin):
 @admin.register(Student)
 class StudentAdmin(ImportableExportableAdmin):
     list_display = ["user", "registration_no", "department", "semester", "batch_no"]
+    actions = [provision_user_credentials]
 
     def import_parse_and_save_xlsx_data(
         self, extra_params: dict[str, Any], workbook: Workbook
@@ -192,7 +241,14 @@ class StudentAdmin(ImportableExportableAdmin):
 
 @admin.register(Supervisor)
 class SupervisorAdmin(ImportableExportableAdmin):
-    list_display = ["user", "supervisor_id", "research_interest", "academic_background"]
+    list_display = [
+        "user",
+        "supervisor_id",
+        "research_interest",
+        "academic_background",
+        "capacity",
+    ]
+    actions = [provision_user_credentials]
 
     def import_parse_and_save_xlsx_data(
         self, extra_params: dict[str, Any], workbook: Workbook
@@ -312,6 +368,7 @@ class SupervisorAdmin(ImportableExportableAdmin):
 @admin.register(CommitteeMember)
 class CommitteeMemberAdmin(ImportableExportableAdmin):
     list_display = ["user", "committee_id", "panel"]
+    actions = [provision_user_credentials]
 
     def import_parse_and_save_xlsx_data(
         self, extra_params: dict[str, Any], workbook: Workbook
@@ -421,6 +478,7 @@ class ProjectCategoriesAdmin(ImportableExportableAdmin):
     list_display = [
         "category_name",
     ]
+    actions = [download_assignment_plan, assign_supervisors]
 
     def import_parse_and_save_xlsx_data(
         self, extra_params: dict[str, Any], workbook: Workbook
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class MyAppConfig(AppConfig):  # NoQa
     default_auto_field = "django.db.models.BigAutoField"
     name = "app"
+
+    def ready(self):
+        from . import signals  # noqa: F401
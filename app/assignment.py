@@ -0,0 +1,381 @@
+import heapq
+from collections import defaultdict
+from typing import NamedTuple
+
+from django.db import transaction
+from openpyxl import Workbook
+
+from .models import Group, Supervisor, SupervisorOfStudentGroup
+
+# marginal cost of a supervisor's k-th group is COST_SCALE * k // capacity:
+# increasing in k, so the cheapest assignment spreads groups evenly relative
+# to each supervisor's capacity
+COST_SCALE = 1000
+
+REPORT_HEADERS = ["Group", "Category", "Students", "Supervisor", "Project", "Note"]
+
+
+class Assignment(NamedTuple):
+    group: Group
+    supervisor: Supervisor
+    project_id: int
+    requested: bool
+
+
+class AssignmentPlan:
+    """The outcome of ``plan_assignments``; nothing is written until ``apply``."""
+
+    def __init__(self, assignments, unassigned, supervisors):
+        self.assignments = assignments
+        # (group, reason) pairs
+        self.unassigned = unassigned
+        self.supervisors = supervisors
+
+    def loads(self):
+        """Supervisor -> (accepted groups before, groups added by the plan)."""
+        added = defaultdict(int)
+        for assignment in self.assignments:
+            added[assignment.supervisor.pk] += 1
+        return {
+            supervisor: (supervisor.accepted_groups, added[supervisor.pk])
+            for supervisor in self.supervisors
+        }
+
+    def workbook(self):
+        workbook = Workbook()
+        worksheet = workbook.active
+        worksheet.title = "Assignments"
+        worksheet.append(REPORT_HEADERS)
+        for group, supervisor, project_id, requested in self.assignments:
+            worksheet.append(
+                [
+                    group.pk,
+                    group.project_category.category_name,
+                    f"{group.student_1} & {group.student_2}",
+                    str(supervisor),
+                    project_id,
+                    "requested by the group" if requested else "",
+                ]
+            )
+        for group, reason in self.unassigned:
+            worksheet.append(
+                [
+                    group.pk,
+                    group.project_category.category_name,
+                    f"{group.student_1} & {group.student_2}",
+                    "",
+                    "",
+                    reason,
+                ]
+            )
+
+        loads = workbook.create_sheet("Supervisor load")
+        loads.append(["Supervisor", "Capacity", "Accepted before", "Assigned"])
+        for supervisor, (before, added) in self.loads().items():
+            loads.append([str(supervisor), supervisor.capacity, before, added])
+        return workbook
+
+    def _revalidate(self):
+        """
+        Drops the assignments that went stale since planning: groups that got
+        an accepted supervisor meanwhile and, in group order, assignments
+        beyond the capacity a supervisor has left now. The planned groups
+        and supervisors are locked first so that neither changes before
+        ``apply`` writes. Dropped groups move to ``unassigned``.
+        """
+        group_ids = [assignment.group.pk for assignment in self.assignments]
+        supervisor_ids = {assignment.supervisor.pk for assignment in self.assignments}
+        list(
+            Group.objects.select_for_update()
+            .filter(pk__in=group_ids)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        list(
+            Supervisor.objects.select_for_update()
+            .filter(pk__in=supervisor_ids)
+            .order_by("id")
+            .values_list("id", flat=True)
+        )
+        supervised = set(
+            SupervisorOfStudentGroup.objects.filter(
+                group__in=group_ids, status="accepted"
+            ).values_list("group_id", flat=True)
+        )
+        remaining = dict(
+            Supervisor.objects.filter(pk__in=supervisor_ids)
+            .with_load()
+            .values_list("pk", "remaining_capacity")
+        )
+
+        assignments = []
+        for assignment in self.assignments:
+            if assignment.group.pk in supervised:
+                reason = "Got a supervisor after the plan was made"
+            elif not remaining[assignment.supervisor.pk]:
+                reason = "The planned supervisor has no capacity left anymore"
+            else:
+                remaining[assignment.supervisor.pk] -= 1
+                assignments.append(assignment)
+                continue
+            self.unassigned.append((assignment.group, reason))
+        self.assignments = assignments
+
+    @transaction.atomic
+    def apply(self):
+        """
+        Accepts the planned requests, reusing a request the group already
+        sent to the supervisor, and cancels the other open requests of the
+        assigned groups. Assignments that went stale since planning are
+        skipped; returns how many were written.
+        """
+        self._revalidate()
+        existing = {
+            (request.group_id, request.supervisor_id): request
+            for request in SupervisorOfStudentGroup.objects.select_for_update().filter(
+                group__in=[assignment.group for assignment in self.assignments]
+            )
+        }
+        accepted = []
+        created = []
+        for group, supervisor, project_id, _ in self.assignments:
+            request = existing.get((group.pk, supervisor.pk))
+            if request is None:
+                request = SupervisorOfStudentGroup(
+                    group=group,
+                    supervisor=supervisor,
+                    project_id=project_id,
+                    created_by_id=group.student_1_id,
+                )
+                created.append(request)
+            else:
+                accepted.append(request)
+            request.status = "accepted"
+
+        SupervisorOfStudentGroup.create_evaluation_forms(accepted + created)
+        SupervisorOfStudentGroup.objects.bulk_update(
+            accepted,
+            [
+                "status",
+                *(field for field, _ in SupervisorOfStudentGroup.EVALUATION_FORMS),
+            ],
+            batch_size=500,
+        )
+        SupervisorOfStudentGroup.objects.bulk_create(created, batch_size=500)
+        # the accepted rows are no longer pending, so only the others change
+        SupervisorOfStudentGroup.objects.filter(
+            group__in=[assignment.group for assignment in self.assignments],
+            status__in=SupervisorOfStudentGroup.PENDING_STATUSES,
+        ).update(status="canceled")
+        return len(self.assignments)
+
+
+def _min_cost_flow(node_count, edges, source, sink):
+    """
+    Successive shortest paths with Dijkstra over reduced costs. ``edges`` are
+    ``(tail, head, capacity, cost)`` with non-negative costs; returns the flow
+    on each of them.
+    """
+    graph = [[] for _ in range(node_count)]
+    heads, capacities, costs = [], [], []
+    for tail, head, capacity, cost in edges:
+        graph[tail].append(len(heads))
+        heads.append(head)
+        capacities.append(capacity)
+        costs.append(cost)
+        graph[head].append(len(heads))
+        heads.append(tail)
+        capacities.append(0)
+        costs.append(-cost)
+
+    potentials = [0] * node_count
+    infinity = float("inf")
+    while True:
+        distances = [infinity] * node_count
+        through = [-1] * node_count
+        distances[source] = 0
+        queue = [(0, source)]
+        while queue:
+            distance, node = heapq.heappop(queue)
+            if distance > distances[node]:
+                continue
+            if node == sink:
+                break
+            reduced = distance + potentials[node]
+            for edge in graph[node]:
+                if capacities[edge]:
+                    head = heads[edge]
+                    candidate = reduced + costs[edge] - potentials[head]
+                    if candidate < distances[head]:
+                        distances[head] = candidate
+                        through[head] = edge
+                        heapq.heappush(queue, (candidate, head))
+        if distances[sink] == infinity:
+            break
+        limit = distances[sink]
+        for node in range(node_count):
+            potentials[node] += min(distances[node], limit)
+
+        bottleneck = infinity
+        node = sink
+        while node != source:
+            edge = through[node]
+            bottleneck = min(bottleneck, capacities[edge])
+            node = heads[edge ^ 1]
+        node = sink
+        while node != source:
+            edge = through[node]
+            capacities[edge] -= bottleneck
+            capacities[edge ^ 1] += bottleneck
+            node = heads[edge ^ 1]
+
+    return [capacities[2 * index + 1] for index in range(len(edges))]
+
+
+def plan_assignments(categories=None):
+    """
+    Plans supervisors for the accepted groups that have none yet, as a
+    min-cost flow source -> groups -> supervisor -> sink: as many groups as
+    capacities allow are assigned, within their project category and never
+    to a supervisor who declined them, with the load spread evenly. A group
+    is assigned the project of its latest supervisor request; groups that
+    never chose a project are reported.
+    """
+    groups = (
+        Group.objects.filter(status="accepted")
+        .exclude(supervisor_request__status="accepted")
+        .select_related("project_category", "student_1__user", "student_2__user")
+        .order_by("id")
+    )
+    if categories is not None:
+        groups = groups.filter(project_category__in=categories)
+    groups = list(groups)
+
+    projects = {}
+    requested = defaultdict(set)
+    declined = defaultdict(set)
+    for group_id, supervisor_id, project_id, status in (
+        SupervisorOfStudentGroup.objects.filter(group__in=groups)
+        .order_by("id")
+        .values_list("group_id", "supervisor_id", "project_id", "status")
+    ):
+        projects[group_id] = project_id
+        if status in SupervisorOfStudentGroup.PENDING_STATUSES:
+            requested[group_id].add(supervisor_id)
+        elif status == "rejected":
+            declined[group_id].add(supervisor_id)
+
+    unassigned = [
+        (group, "No project chosen yet") for group in groups if group.pk not in projects
+    ]
+    by_category = defaultdict(list)
+    for group in groups:
+        if group.pk in projects:
+            by_category[group.project_category_id].append(group)
+
+    category_ids = list(by_category)
+    memberships = Supervisor.category.through.objects.filter(
+        projectcategories__in=category_ids
+    )
+    supervisors = list(
+        Supervisor.objects.select_related("user")
+        .with_load()
+        # a subquery rather than a join on the categories, which would
+        # count the accepted groups once per matching category
+        .filter(remaining_capacity__gt=0, pk__in=memberships.values("supervisor_id"))
+        .order_by("id")
+    )
+    eligible = defaultdict(set)
+    for supervisor_id, category_id in memberships.filter(
+        supervisor__in=supervisors
+    ).values_list("supervisor_id", "projectcategories_id"):
+        eligible[category_id].add(supervisor_id)
+
+    # groups of a category that were declined by the same supervisors can
+    # take the same slots, so the network has a node per such class of
+    # groups rather than per group
+    classes = defaultdict(list)
+    for category_id in category_ids:
+        for group in by_category[category_id]:
+            refused = frozenset(declined[group.pk] & eligible[category_id])
+            classes[category_id, refused].append(group)
+    class_nodes = {key: 2 + index for index, key in enumerate(classes)}
+    supervisor_nodes = {
+        supervisor.pk: 2 + len(classes) + index
+        for index, supervisor in enumerate(supervisors)
+    }
+    source, sink = 0, 1
+
+    edges = [
+        (source, class_nodes[key], len(class_groups), 0)
+        for key, class_groups in classes.items()
+    ]
+    class_edges = []
+    for key, class_groups in classes.items():
+        category_id, refused = key
+        for supervisor_id in sorted(eligible[category_id] - refused):
+            class_edges.append((len(edges), key, supervisor_id))
+            edges.append(
+                (
+                    class_nodes[key],
+                    supervisor_nodes[supervisor_id],
+                    len(class_groups),
+                    0,
+                )
+            )
+    for supervisor in supervisors:
+        for slot in range(supervisor.remaining_capacity):
+            load = supervisor.accepted_groups + slot + 1
+            edges.append(
+                (
+                    supervisor_nodes[supervisor.pk],
+                    sink,
+                    1,
+                    COST_SCALE * load // supervisor.capacity,
+                )
+            )
+
+    flows = _min_cost_flow(2 + len(classes) + len(supervisors), edges, source, sink)
+
+    # hand each class's groups to the supervisors the flow picked, giving
+    # groups the supervisor they asked for where the flow allows it
+    supervisors_by_id = {supervisor.pk: supervisor for supervisor in supervisors}
+    quotas = defaultdict(dict)
+    for edge, key, supervisor_id in class_edges:
+        if flows[edge]:
+            quotas[key][supervisor_id] = flows[edge]
+    assignments = []
+    for key, class_groups in classes.items():
+        category_id, refused = key
+        quota = quotas[key]
+        remaining = []
+        for group in class_groups:
+            wanted = next(
+                (pk for pk in sorted(requested[group.pk]) if quota.get(pk)), None
+            )
+            if wanted is None:
+                remaining.append(group)
+                continue
+            quota[wanted] -= 1
+            assignments.append(
+                Assignment(group, supervisors_by_id[wanted], projects[group.pk], True)
+            )
+
+        if eligible[category_id] and eligible[category_id] <= refused:
+            reason = "Every supervisor of the category with capacity left declined it"
+        else:
+            reason = "No supervisor of the category has capacity left"
+        for group in remaining:
+            supervisor_id = next((pk for pk, count in quota.items() if count), None)
+            if supervisor_id is None:
+                unassigned.append((group, reason))
+                continue
+            quota[supervisor_id] -= 1
+            assignments.append(
+                Assignment(
+                    group, supervisors_by_id[supervisor_id], projects[group.pk], False
+                )
+            )
+
+    assignments.sort(key=lambda assignment: assignment.group.pk)
+    return AssignmentPlan(assignments, unassigned, supervisors)
@@ -0,0 +1,207 @@
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models.functions import Lower
+from django.utils.functional import cached_property
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# token claim -> CustomUser property holding the matching role profile
+PROFILE_CLAIMS = {
+    "student_id": "student",
+    "supervisor_id": "supervisor",
+    "committee_member_id": "committee_member",
+}
+PROFILE_VERSION_CLAIM = "profile_version"
+
+
+def profile_claims(user):
+    """
+    Claims describing the user's role profile, embedded in issued tokens so
+    that requests can be scoped without loading the profile again.
+    """
+    claims = {
+        "user_type": user.user_type,
+        PROFILE_VERSION_CLAIM: user.profile_version,
+    }
+    for claim, relation in PROFILE_CLAIMS.items():
+        profile = getattr(user, relation)
+        if profile is not None:
+            claims[claim] = profile.id
+    return claims
+
+
+class DuplicateEmailError(Exception):
+    def __init__(self, email):
+        self.email = email
+        super().__init__(f"More than one account uses the email {email}")
+
+
+def find_login_user(email, relation):
+    """
+    Resolves the user owning ``email`` (case-insensitively) together with
+    their role profile in one query backed by the ``lower(email)`` index.
+    Only users that have the ``relation`` profile are considered.
+    """
+    user_model = get_user_model()
+    users = list(
+        user_model.objects.select_related(*user_model.PROFILE_RELATIONS)
+        .alias(email_lower=Lower("email"))
+        .filter(email_lower=email.strip().lower(), **{f"{relation}__isnull": False})[:2]
+    )
+    if len(users) > 1:
+        raise DuplicateEmailError(email)
+    return users[0] if users else None
+
+
+def find_student_login_user(registration_no):
+    """Resolves the student user with ``registration_no`` and their profiles."""
+    user_model = get_user_model()
+    return (
+        user_model.objects.select_related(*user_model.PROFILE_RELATIONS)
+        .filter(student_profile__registration_no=registration_no)
+        .first()
+    )
+
+
+class ProfileVersionCache:
+    """
+    Bounded, thread-safe LRU mapping user id to the profile version last seen
+    in the database. Entries expire after ``ttl`` seconds so that a version
+    bump made by another process is picked up within that window.
+    """
+
+    def __init__(self, maxsize, ttl):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, user_id):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            version, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return version
+
+    def set(self, user_id, version):
+        with self._lock:
+            self._entries[user_id] = (version, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def forget(self, user_id):
+        with self._lock:
+            self._entries.pop(user_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+profile_versions = ProfileVersionCache(
+    maxsize=getattr(settings, "PROFILE_VERSION_CACHE_SIZE", 10000),
+    ttl=getattr(settings, "PROFILE_VERSION_CACHE_TTL", 30),
+)
+
+
+class TokenProfileUser:
+    """
+    Stand-in for ``CustomUser`` used when a token's profile version matches
+    the cached one. The user id, role and profile ids come straight from the
+    verified token; any other attribute loads the real user (with its
+    profile) on first access.
+    """
+
+    is_authenticated = True
+    is_anonymous = False
+
+    def __init__(self, validated_token, loader):
+        self.token = validated_token
+        self.id = self.pk = validated_token[api_settings.USER_ID_CLAIM]
+        self.user_type = validated_token.get("user_type")
+        self.profile_version = validated_token.get(PROFILE_VERSION_CLAIM)
+        for claim in PROFILE_CLAIMS:
+            setattr(self, claim, validated_token.get(claim))
+        self._loader = loader
+
+    @cached_property
+    def user(self):
+        return self._loader(self.token)
+
+    def __getattr__(self, name):
+        if name.startswith("__") or name in ("token", "_loader"):
+            raise AttributeError(name)
+        return getattr(self.user, name)
+
+    def __eq__(self, other):
+        if not hasattr(other, "pk"):
+            return NotImplemented
+        return self.pk == other.pk
+
+    def __hash__(self):
+        return hash(self.pk)
+
+    def __str__(self):
+        return f"TokenProfileUser {self.id}"
+
+
+class ProfileJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that loads the user together with their role profile
+    (student, supervisor or committee member) in a single joined query.
+
+    Views read the caller's role through ``request.user.student``,
+    ``request.user.supervisor`` and ``request.user.committee_member`` (or the
+    matching ``*_id`` attributes) instead of looking the profile up again.
+    When the token's profile version matches the cached one the database is
+    not touched at all until a view needs more than the ids.
+    """
+
+    def get_user(self, validated_token):
+        version = validated_token.get(PROFILE_VERSION_CLAIM)
+        user_id = validated_token.get(api_settings.USER_ID_CLAIM)
+        if version is not None and profile_versions.get(user_id) == version:
+            return TokenProfileUser(validated_token, self.load_user)
+
+        user = self.load_user(validated_token)
+        profile_versions.set(user.pk, user.profile_version)
+        return user
+
+    def load_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        try:
+            user = self.user_model.objects.select_related(
+                *self.user_model.PROFILE_RELATIONS
+            ).get(**{api_settings.USER_ID_FIELD: user_id})
+        except self.user_model.DoesNotExist:
+            raise AuthenticationFailed(_("User not found"), code="user_not_found")
+
+        if api_settings.CHECK_USER_IS_ACTIVE and not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(
+                api_settings.REVOKE_TOKEN_CLAIM
+            ) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(
+                    _("The user's password has been changed."), code="password_changed"
+                )
+
+        return user
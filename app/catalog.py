@@ -0,0 +1,42 @@
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework.utils.encoders import JSONEncoder
+
+from .models import ProjectCategories
+from .serializers.serializers import ProjectCategoriesSerializer
+
+CATALOG_CACHE_KEY = "app:project-category-catalog"
+
+
+def build_catalog():
+    """Every category with its supervisors and their users, in three queries."""
+    categories = ProjectCategories.objects.prefetch_related(
+        "supervisor__user"
+    ).order_by("id")
+    data = ProjectCategoriesSerializer(
+        categories, many=True, expand={"supervisor": {}}
+    ).data
+    content = json.dumps(data, cls=JSONEncoder, sort_keys=True).encode()
+    return {"data": data, "digest": hashlib.sha1(content).hexdigest()}
+
+
+def get_catalog():
+    """
+    The serialized catalog and a digest of it, from the cache when possible.
+    """
+    catalog = cache.get(CATALOG_CACHE_KEY)
+    if catalog is None:
+        catalog = build_catalog()
+        cache.set(
+            CATALOG_CACHE_KEY,
+            catalog,
+            getattr(settings, "CATEGORY_CATALOG_CACHE_TTL", 300),
+        )
+    return catalog
+
+
+def invalidate_catalog():
+    cache.delete(CATALOG_CACHE_KEY)
@@ -0,0 +1,149 @@
+from django.db import IntegrityError, transaction
+
+from .models import Group, GroupMembership, Student
+
+
+class GroupTransitionError(Exception):
+    """Raised when a group mate request cannot make the requested transition."""
+
+    def __init__(self, message, forbidden=False):
+        self.message = message
+        # the caller may not make the transition at all, as opposed to it
+        # no longer being possible
+        self.forbidden = forbidden
+        super().__init__(message)
+
+
+class _SiblingsChanged(Exception):
+    """A request of the students was sent between reading and locking its rows."""
+
+
+def _lock(group_id):
+    """
+    Locks every row a transition of ``group_id`` may write: the memberships
+    of the students of the group and of its pending sibling requests, then
+    those groups, then those students, each by id. Every transition takes
+    its locks in this one order, so concurrent transitions wait on each
+    other instead of deadlocking, including when cancelling the siblings
+    touches students outside the group.
+
+    Returns the locked group and the ids of the other pending requests of
+    its two students.
+    """
+    try:
+        students = Group.objects.values_list("student_1_id", "student_2_id").get(
+            pk=group_id
+        )
+    except Group.DoesNotExist:
+        raise GroupTransitionError("Group mate request not found")
+
+    # read without locks first, so that the locks below are taken at once
+    siblings = set(
+        GroupMembership.objects.filter(student__in=students, status="pending")
+        .exclude(group=group_id)
+        .values_list("group_id", flat=True)
+    )
+    involved = {
+        *students,
+        *GroupMembership.objects.filter(group__in=siblings).values_list(
+            "student_id", flat=True
+        ),
+    }
+
+    memberships = list(
+        GroupMembership.objects.select_for_update()
+        .filter(student__in=involved)
+        .order_by("id")
+        .values_list("group_id", "student_id", "status")
+    )
+    locked_siblings = {
+        pk
+        for pk, student_id, status in memberships
+        if student_id in students and status == "pending" and pk != group_id
+    }
+    if not locked_siblings <= siblings:
+        raise _SiblingsChanged
+    groups = {
+        group.pk: group
+        for group in Group.objects.select_for_update()
+        .filter(pk__in={group_id, *siblings})
+        .order_by("id")
+    }
+    list(
+        Student.objects.select_for_update()
+        .filter(pk__in=involved)
+        .order_by("id")
+        .values_list("id", flat=True)
+    )
+    group = groups.pop(group_id)
+    siblings = [pk for pk, sibling in groups.items() if sibling.status == "pending"]
+    return group, siblings
+
+
+def _check_pending(group):
+    if group.status != "pending":
+        raise GroupTransitionError("Group mate request is no longer pending")
+
+
+def _check_actor(group, student_id, role):
+    if getattr(group, f"{role}_id") != student_id:
+        raise GroupTransitionError(
+            "You are not allowed to change this group mate request", forbidden=True
+        )
+
+
+def _transition(group_id, student_id, role, apply):
+    """
+    Runs ``apply(group, siblings)`` on the locked, still pending group in a
+    transaction, starting over when a sibling request appeared meanwhile.
+    Only the student in ``role`` (``student_1`` the sender, ``student_2``
+    the recipient) of the locked row may make the transition.
+    """
+    while True:
+        try:
+            with transaction.atomic():
+                group, siblings = _lock(group_id)
+                _check_actor(group, student_id, role)
+                _check_pending(group)
+                apply(group, siblings)
+            return group
+        except _SiblingsChanged:
+            continue
+
+
+def _accept(group, siblings):
+    try:
+        with transaction.atomic():
+            group.accept()
+    except IntegrityError:
+        if GroupMembership.objects.filter(
+            student=group.student_1_id, status="accepted"
+        ).exists():
+            raise GroupTransitionError("You are too late to accept group mate request")
+        raise GroupTransitionError("someone already choose you as group mate")
+    Group.objects.filter(pk__in=siblings).update_status("canceled")
+
+
+def _set_status(status):
+    def apply(group, siblings):
+        group.status = status
+        group.save(update_fields=["status"])
+
+    return apply
+
+
+def accept_group_request(group_id, student_id):
+    """
+    Accepts the request on behalf of its recipient ``student_id`` and
+    cancels every other pending request of both students, all in one
+    transaction.
+    """
+    return _transition(group_id, student_id, "student_2", _accept)
+
+
+def reject_group_request(group_id, student_id):
+    return _transition(group_id, student_id, "student_2", _set_status("rejected"))
+
+
+def cancel_group_request(group_id, student_id):
+    return _transition(group_id, student_id, "student_1", _set_status("canceled"))
@@ -0,0 +1,178 @@
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from typing import NamedTuple
+
+import django
+from django.conf import settings
+from django.contrib.auth.hashers import check_password, make_password
+
+
+class LoginPoolBusy(Exception):
+    """Raised when no slot is free in the login pool; views answer 503."""
+
+
+class PasswordCheck(NamedTuple):
+    valid: bool
+    queue_wait: float
+    hash_time: float
+
+    @property
+    def server_timing(self) -> str:
+        return (
+            f"queue;dur={self.queue_wait * 1000:.1f}, "
+            f"hash;dur={self.hash_time * 1000:.1f}"
+        )
+
+
+def init_hash_worker():
+    # spawned workers start from a fresh interpreter and need the app
+    # registry for the hashers
+    django.setup()
+
+
+def _verify(raw_password, encoded):
+    """
+    Runs in a pool worker. Returns whether the password matches, the new
+    encoded hash if the stored one must be upgraded, and the hashing time.
+    """
+    started = time.perf_counter()
+    upgraded = []
+    valid = check_password(
+        raw_password, encoded, setter=lambda raw: upgraded.append(make_password(raw))
+    )
+    return valid, upgraded[0] if upgraded else None, time.perf_counter() - started
+
+
+class LoginPoolStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.checks = 0
+            self.rejected = 0
+            self.timeouts = 0
+            self.queue_wait_total = 0.0
+            self.queue_wait_max = 0.0
+            self.hash_time_total = 0.0
+            self.hash_time_max = 0.0
+
+    def record(self, check: PasswordCheck):
+        with self._lock:
+            self.checks += 1
+            self.queue_wait_total += check.queue_wait
+            self.queue_wait_max = max(self.queue_wait_max, check.queue_wait)
+            self.hash_time_total += check.hash_time
+            self.hash_time_max = max(self.hash_time_max, check.hash_time)
+
+    def record_rejected(self):
+        with self._lock:
+            self.rejected += 1
+
+    def record_timeout(self):
+        with self._lock:
+            self.timeouts += 1
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            checks = self.checks or 1
+            return {
+                "checks": self.checks,
+                "rejected": self.rejected,
+                "timeouts": self.timeouts,
+                "queue_wait_avg_ms": self.queue_wait_total / checks * 1000,
+                "queue_wait_max_ms": self.queue_wait_max * 1000,
+                "hash_time_avg_ms": self.hash_time_total / checks * 1000,
+                "hash_time_max_ms": self.hash_time_max * 1000,
+            }
+
+
+class LoginPool:
+    """
+    Verifies password hashes off the request thread in a bounded process
+    pool. At most ``workers + queue_limit`` checks are in flight per process;
+    further logins are rejected straight away with ``LoginPoolBusy`` instead
+    of tying up a WSGI worker behind a queue of 600k-iteration hashes.
+
+    With ``workers = 0`` the hash is verified inline, still behind the same
+    in-flight limit.
+    """
+
+    def __init__(self, workers, queue_limit, timeout):
+        self.workers = workers
+        self.queue_limit = queue_limit
+        self.timeout = timeout
+        self.stats = LoginPoolStats()
+        self._slots = threading.BoundedSemaphore(max(workers, 1) + queue_limit)
+        self._executor = None
+        self._executor_lock = threading.Lock()
+
+    def _get_executor(self):
+        with self._executor_lock:
+            if self._executor is None:
+                # spawned rather than forked: forking a multithreaded web
+                # worker can copy locks held by its other threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context("spawn"),
+                    initializer=init_hash_worker,
+                )
+            return self._executor
+
+    def _reset_executor(self):
+        with self._executor_lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def check_password(self, user, raw_password) -> PasswordCheck:
+        if not self._slots.acquire(blocking=False):
+            self.stats.record_rejected()
+            raise LoginPoolBusy()
+        # the slot is held until the hash is done, even when the request
+        # gives up waiting for it, so the bound covers hashes still running
+        release = self._slots.release
+        try:
+            submitted = time.perf_counter()
+            if self.workers:
+                try:
+                    future = self._get_executor().submit(
+                        _verify, raw_password, user.password
+                    )
+                    future.add_done_callback(lambda _: self._slots.release())
+                    release = None
+                    valid, upgraded, hash_time = future.result(timeout=self.timeout)
+                except FutureTimeoutError:
+                    self.stats.record_timeout()
+                    raise LoginPoolBusy()
+                except BrokenProcessPool:
+                    self._reset_executor()
+                    raise LoginPoolBusy()
+            else:
+                valid, upgraded, hash_time = _verify(raw_password, user.password)
+            check = PasswordCheck(
+                valid=valid,
+                queue_wait=time.perf_counter() - submitted - hash_time,
+                hash_time=hash_time,
+            )
+        finally:
+            if release is not None:
+                release()
+
+        self.stats.record(check)
+        if upgraded:
+            user.password = upgraded
+            user.save(update_fields=["password"])
+        return check
+
+
+login_pool = LoginPool(
+    workers=getattr(settings, "LOGIN_HASH_WORKERS", 2),
+    queue_limit=getattr(settings, "LOGIN_HASH_QUEUE_LIMIT", 16),
+    timeout=getattr(settings, "LOGIN_HASH_TIMEOUT", 10),
+)
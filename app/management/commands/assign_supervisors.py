@@ -0,0 +1,62 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.assignment import plan_assignments
+from app.models import ProjectCategories
+
+
+class Command(BaseCommand):
+    help = (
+        "Plans supervisors for every accepted group without one, balancing "
+        "the load over supervisor capacities. Only reports the plan unless "
+        "--apply is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--category",
+            type=int,
+            action="append",
+            help="Only plan groups of this category id (repeatable)",
+        )
+        parser.add_argument(
+            "--report", help="Also write the plan to this .xlsx workbook"
+        )
+        parser.add_argument(
+            "--apply", action="store_true", help="Write the planned assignments"
+        )
+
+    def handle(self, *args, **options):
+        categories = None
+        if options["category"]:
+            categories = ProjectCategories.objects.filter(pk__in=options["category"])
+
+        started = time.perf_counter()
+        plan = plan_assignments(categories)
+        self.stdout.write(
+            f"Planned {len(plan.assignments)} assignment(s) in "
+            f"{time.perf_counter() - started:.2f}s, "
+            f"{len(plan.unassigned)} group(s) left unassigned"
+        )
+        for supervisor, (before, added) in plan.loads().items():
+            if added:
+                self.stdout.write(
+                    f"  {supervisor}: {before} + {added} of {supervisor.capacity}"
+                )
+        for group, reason in plan.unassigned:
+            self.stdout.write(f"  group {group.pk}: {reason}")
+
+        if options["report"]:
+            plan.workbook().save(options["report"])
+        if options["apply"]:
+            planned = len(plan.assignments)
+            applied = plan.apply()
+            self.stdout.write(self.style.SUCCESS(f"Assigned {applied} group(s)"))
+            if applied < planned:
+                self.stdout.write(
+                    f"{planned - applied} planned assignment(s) went stale and "
+                    "were skipped"
+                )
+        else:
+            self.stdout.write("Dry run, nothing written; use --apply to assign")
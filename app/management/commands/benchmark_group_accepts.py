@@ -0,0 +1,163 @@
+import statistics
+import threading
+import time
+import uuid
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import OperationalError, connection, transaction
+from django.db.models import Count
+
+from app.group_transitions import GroupTransitionError, accept_group_request
+from app.models import CustomUser, Group, GroupMembership, ProjectCategories, Student
+
+
+class Command(BaseCommand):
+    help = (
+        "Fires concurrent accepts at overlapping group mate requests of "
+        "throw-away students and reports latency, outcomes and whether the "
+        "one-accepted-group-per-student invariant held. SQLite locks the whole "
+        "database for writing, so row-lock contention is only measured on MySQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--students", type=int, default=400)
+        parser.add_argument(
+            "--requests-per-student",
+            type=int,
+            default=3,
+            help="Requests each student sends to the following students",
+        )
+        parser.add_argument("--workers", type=int, default=16)
+        parser.add_argument(
+            "--keep", action="store_true", help="Keep the generated data"
+        )
+
+    def handle(self, *args, **options):
+        prefix = f"bench-{uuid.uuid4().hex[:8]}"
+        category, requests = self.create_requests(
+            prefix, options["students"], options["requests_per_student"]
+        )
+        try:
+            outcomes, latencies, elapsed = self.run(requests, options["workers"])
+            self.report(prefix, outcomes, latencies, elapsed)
+        finally:
+            if not options["keep"]:
+                CustomUser.objects.filter(username__startswith=prefix).delete()
+                category.delete()
+
+    def create_requests(self, prefix, students, requests_per_student):
+        with transaction.atomic():
+            category = ProjectCategories.objects.create(category_name=prefix)
+            users = CustomUser.objects.bulk_create(
+                CustomUser(
+                    username=f"{prefix}-{i}",
+                    email=f"{prefix}-{i}@example.com",
+                    user_type="student",
+                )
+                for i in range(students)
+            )
+            if users[0].pk is None:
+                users = list(
+                    CustomUser.objects.filter(username__startswith=prefix).order_by(
+                        "id"
+                    )
+                )
+            profiles = Student.objects.bulk_create(
+                Student(user_id=user.pk, registration_no=user.username)
+                for user in users
+            )
+            if profiles[0].pk is None:
+                profiles = list(
+                    Student.objects.filter(user__in=users).order_by("user_id")
+                )
+
+            Group.objects.bulk_create(
+                Group(
+                    student_1=sender,
+                    student_2=profiles[(i + offset) % students],
+                    project_category=category,
+                )
+                for i, sender in enumerate(profiles)
+                for offset in range(1, requests_per_student + 1)
+            )
+            groups = list(
+                Group.objects.filter(project_category=category).values_list(
+                    "id", "student_1_id", "student_2_id"
+                )
+            )
+            GroupMembership.objects.bulk_create(
+                GroupMembership(student_id=student_id, group_id=group_id)
+                for group_id, *members in groups
+                for student_id in members
+            )
+        return category, [(group_id, recipient) for group_id, _, recipient in groups]
+
+    def run(self, requests, workers):
+        start = threading.Event()
+        outcomes = Counter()
+        latencies = []
+        lock = threading.Lock()
+
+        def accept(group_id, recipient_id):
+            start.wait()
+            started = time.perf_counter()
+            try:
+                accept_group_request(group_id, recipient_id)
+                outcome = "accepted"
+            except GroupTransitionError as ex:
+                outcome = f"refused: {ex.message}"
+            except OperationalError as ex:
+                outcome = f"database error: {ex}"
+            finally:
+                latency = time.perf_counter() - started
+                connection.close()
+            with lock:
+                outcomes[outcome] += 1
+                latencies.append(latency)
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(accept, group_id, recipient_id)
+                for group_id, recipient_id in requests
+            ]
+            started = time.perf_counter()
+            start.set()
+            for future in futures:
+                future.result()
+            elapsed = time.perf_counter() - started
+        return outcomes, latencies, elapsed
+
+    def report(self, prefix, outcomes, latencies, elapsed):
+        quantiles = statistics.quantiles(latencies, n=100) if len(latencies) > 1 else []
+        self.stdout.write(
+            f"{len(latencies)} accepts in {elapsed:.2f}s "
+            f"({len(latencies) / elapsed:.0f}/s)"
+        )
+        if quantiles:
+            self.stdout.write(
+                f"latency p50={quantiles[49] * 1000:.1f}ms "
+                f"p95={quantiles[94] * 1000:.1f}ms "
+                f"max={max(latencies) * 1000:.1f}ms"
+            )
+        for outcome, count in outcomes.most_common():
+            self.stdout.write(f"  {count:6d}  {outcome}")
+
+        doubled = (
+            GroupMembership.objects.filter(
+                student__user__username__startswith=prefix, status="accepted"
+            )
+            .values("student")
+            .annotate(groups=Count("group"))
+            .filter(groups__gt=1)
+            .count()
+        )
+        if doubled:
+            self.stdout.write(
+                self.style.ERROR(f"{doubled} student(s) ended up in several groups")
+            )
+        else:
+            self.stdout.write(
+                self.style.SUCCESS("No student is in two accepted groups")
+            )
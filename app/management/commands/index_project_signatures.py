@@ -0,0 +1,88 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.models import Project
+from app.similarity import index_projects, project_text, shingles, similar_projects
+
+
+class Command(BaseCommand):
+    help = (
+        "Computes the MinHash signatures and LSH buckets of every project. "
+        "With --benchmark, also compares indexed near-duplicate lookups with "
+        "a brute-force comparison against every project."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=500)
+        parser.add_argument(
+            "--benchmark",
+            action="store_true",
+            help="Time lookups against the index and against a full scan",
+        )
+        parser.add_argument(
+            "--samples", type=int, default=20, help="Projects looked up in --benchmark"
+        )
+        parser.add_argument("--threshold", type=float, default=0.5)
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        indexed = 0
+        last_id = 0
+        while True:
+            batch = list(
+                Project.objects.filter(pk__gt=last_id).order_by("pk")[:batch_size]
+            )
+            if not batch:
+                break
+            index_projects(batch)
+            indexed += len(batch)
+            last_id = batch[-1].pk
+        self.stdout.write(self.style.SUCCESS(f"Indexed {indexed} project(s)"))
+
+        if options["benchmark"] and indexed:
+            self.benchmark(options["samples"], options["threshold"])
+
+    def benchmark(self, samples, threshold):
+        corpus = {
+            project.pk: shingles(project_text(project))
+            for project in Project.objects.all()
+        }
+        sample_ids = random.sample(list(corpus), min(samples, len(corpus)))
+
+        indexed_time = scan_time = 0.0
+        expected = found = 0
+        for project_id in sample_ids:
+            text = project_text(Project.objects.get(pk=project_id))
+
+            started = time.perf_counter()
+            matches = similar_projects(
+                text, threshold=threshold, limit=len(corpus), exclude=project_id
+            )
+            indexed_time += time.perf_counter() - started
+
+            started = time.perf_counter()
+            query = shingles(text)
+            duplicates = {
+                pk
+                for pk, other in corpus.items()
+                if pk != project_id
+                and query
+                and len(query & other) / len(query | other) >= threshold
+            }
+            scan_time += time.perf_counter() - started
+
+            expected += len(duplicates)
+            found += len(duplicates & {project.pk for project, _ in matches})
+
+        self.stdout.write(
+            f"{len(sample_ids)} lookups over {len(corpus)} projects: "
+            f"index {indexed_time / len(sample_ids) * 1000:.1f}ms, "
+            f"full scan {scan_time / len(sample_ids) * 1000:.1f}ms per lookup"
+        )
+        recall = found / expected if expected else 1.0
+        self.stdout.write(
+            f"recall {recall:.0%} ({found} of {expected} pairs at "
+            f"Jaccard >= {threshold})"
+        )
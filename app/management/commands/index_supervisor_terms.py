@@ -0,0 +1,62 @@
+import random
+import time
+
+from django.core.management.base import BaseCommand
+
+from app.models import Project
+from app.recommendations import index_all_supervisors, recommend_supervisors
+from app.similarity import project_text
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuilds the TF-IDF vectors of every supervisor from one consistent "
+        "set of document frequencies. With --benchmark, also times "
+        "recommendations for a sample of projects."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--benchmark",
+            action="store_true",
+            help="Time supervisor recommendations for sample projects",
+        )
+        parser.add_argument(
+            "--samples", type=int, default=20, help="Projects used by --benchmark"
+        )
+        parser.add_argument("--limit", type=int, default=5)
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        indexed = index_all_supervisors()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Indexed {indexed} supervisor(s) in "
+                f"{time.perf_counter() - started:.2f}s"
+            )
+        )
+        if options["benchmark"]:
+            self.benchmark(options["samples"], options["limit"])
+
+    def benchmark(self, samples, limit):
+        project_ids = list(Project.objects.values_list("id", flat=True))
+        if not project_ids:
+            self.stdout.write("No projects to benchmark with")
+            return
+        texts = [
+            project_text(project)
+            for project in Project.objects.filter(
+                id__in=random.sample(project_ids, min(samples, len(project_ids)))
+            )
+        ]
+        latencies = []
+        for text in texts:
+            started = time.perf_counter()
+            recommend_supervisors(text, limit=limit)
+            latencies.append(time.perf_counter() - started)
+        latencies.sort()
+        self.stdout.write(
+            f"{len(latencies)} recommendations: "
+            f"median {latencies[len(latencies) // 2] * 1000:.1f}ms, "
+            f"max {latencies[-1] * 1000:.1f}ms"
+        )
@@ -0,0 +1,59 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from app.models import CustomUser
+from app.provisioning import (
+    credential_workbook,
+    default_password_hash,
+    provision_credentials,
+)
+
+ROLE_RELATIONS = {
+    "student": "student_profile",
+    "supervisor": "supervisor_profile",
+    "committee_member": "committee_member_profile",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Gives imported users a unique random password and writes the "
+        "credentials to an xlsx sheet. By default only users still on the "
+        "shared import password are provisioned."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--output", required=True, help="Path of the xlsx sheet")
+        parser.add_argument("--role", choices=sorted(ROLE_RELATIONS))
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Also reset users that already changed their password",
+        )
+        parser.add_argument(
+            "--processes",
+            type=int,
+            help="Hashing processes (defaults to the number of cores)",
+        )
+
+    def handle(self, *args, **options):
+        users = CustomUser.objects.select_related(*CustomUser.PROFILE_RELATIONS)
+        if options["role"]:
+            relation = ROLE_RELATIONS[options["role"]]
+            users = users.filter(**{f"{relation}__isnull": False})
+        else:
+            users = users.filter(is_superuser=False)
+        if not options["all"]:
+            users = users.filter(password=default_password_hash())
+
+        users = list(users.order_by("id"))
+        if not users:
+            raise CommandError("No users to provision")
+
+        credentials = provision_credentials(users, processes=options["processes"])
+        credential_workbook(credentials).save(options["output"])
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Provisioned {len(credentials)} user(s), credentials written to "
+                f"{options['output']}"
+            )
+        )
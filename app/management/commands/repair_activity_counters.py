@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+from app.models import (
+    ChatRoom,
+    Document,
+    Group,
+    GroupCreationComment,
+    SupervisorOfStudentGroup,
+)
+
+
+def _aggregate(queryset, aggregate):
+    """Correlated subquery yielding one aggregate per outer row."""
+    return Subquery(
+        queryset.order_by()
+        .values("group")
+        .annotate(value=aggregate)
+        .values("value")[:1]
+    )
+
+
+def _count(queryset):
+    return Coalesce(
+        _aggregate(queryset, Count("id")), Value(0), output_field=IntegerField()
+    )
+
+
+def repair_counters():
+    """Recomputes every counter column in two UPDATE statements."""
+    comments = GroupCreationComment.objects.filter(group=OuterRef("pk"))
+    messages = ChatRoom.objects.filter(group=OuterRef("pk"))
+    documents = Document.objects.filter(group=OuterRef("pk"))
+    last_message = _aggregate(messages, Max("created_at"))
+    last_document = _aggregate(documents, Max("uploaded_at"))
+
+    with transaction.atomic():
+        groups = Group.objects.update(
+            comment_count=_count(comments),
+            last_activity_at=_aggregate(comments, Max("created_at")),
+        )
+        supervisions = SupervisorOfStudentGroup.objects.update(
+            message_count=_count(messages),
+            last_activity_at=Greatest(
+                Coalesce(last_message, last_document),
+                Coalesce(last_document, last_message),
+            ),
+            **{
+                f"{document_type}_count": _count(
+                    documents.filter(document_type=document_type)
+                )
+                for document_type, _ in Document._meta.get_field(
+                    "document_type"
+                ).choices
+            },
+        )
+    return groups, supervisions
+
+
+class Command(BaseCommand):
+    help = (
+        "Recomputes the comment, message and document counters and the last "
+        "activity times of groups and supervisor requests from their rows."
+    )
+
+    def handle(self, *args, **options):
+        groups, supervisions = repair_counters()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Recomputed counters of {groups} group(s) and "
+                f"{supervisions} supervisor request(s)"
+            )
+        )
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0045_rename_templates_template"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="customuser",
+            name="profile_version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
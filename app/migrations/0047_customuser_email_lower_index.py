@@ -0,0 +1,21 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:27
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0046_customuser_profile_version"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="customuser",
+            index=models.Index(
+                django.db.models.functions.text.Lower("email"),
+                name="app_customuser_email_lower_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:33
+
+from django.db import migrations
+
+
+def create_memberships(apps, schema_editor):
+    Group = apps.get_model("app", "Group")
+    GroupMembership = apps.get_model("app", "GroupMembership")
+
+    memberships = [
+        GroupMembership(student_id=student_id, group_id=group_id, status=status)
+        for group_id, student_1_id, student_2_id, status in Group.objects.values_list(
+            "id", "student_1_id", "student_2_id", "status"
+        ).iterator()
+        for student_id in {student_1_id, student_2_id}
+    ]
+    GroupMembership.objects.bulk_create(
+        memberships, batch_size=1000, ignore_conflicts=True
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0048_groupmembership"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_memberships, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0049_backfill_groupmembership"),
+    ]
+
+    operations = [
+        migrations.AlterUniqueTogether(
+            name="group",
+            unique_together=set(),
+        ),
+        migrations.AddField(
+            model_name="groupmembership",
+            name="accepted_slot",
+            field=models.PositiveBigIntegerField(
+                blank=True, editable=False, null=True, unique=True
+            ),
+        ),
+    ]
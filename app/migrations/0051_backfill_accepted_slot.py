@@ -0,0 +1,32 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:45
+
+from django.db import migrations
+
+
+def fill_accepted_slots(apps, schema_editor):
+    GroupMembership = apps.get_model("app", "GroupMembership")
+
+    # should a student already be in several accepted groups, only the
+    # oldest one takes the slot so that the unique index can be satisfied
+    seen = set()
+    memberships = []
+    for membership in GroupMembership.objects.filter(status="accepted").order_by(
+        "group_id"
+    ):
+        if membership.student_id in seen:
+            continue
+        seen.add(membership.student_id)
+        membership.accepted_slot = membership.student_id
+        memberships.append(membership)
+    GroupMembership.objects.bulk_update(memberships, ["accepted_slot"], batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0050_groupmembership_accepted_slot"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_accepted_slots, migrations.RunPython.noop),
+    ]
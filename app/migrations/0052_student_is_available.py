@@ -0,0 +1,25 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0051_backfill_accepted_slot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="student",
+            name="is_available",
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                fields=["department", "batch_no", "semester", "is_available"],
+                name="app_student_cohort_idx",
+            ),
+        ),
+    ]
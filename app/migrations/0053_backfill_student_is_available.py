@@ -0,0 +1,23 @@
+# Generated by Django 4.2.30 on 2026-10-18 03:02
+
+from django.db import migrations
+
+
+def mark_grouped_students(apps, schema_editor):
+    Student = apps.get_model("app", "Student")
+    GroupMembership = apps.get_model("app", "GroupMembership")
+
+    Student.objects.filter(
+        pk__in=GroupMembership.objects.filter(status="accepted").values("student_id")
+    ).update(is_available=False)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0052_student_is_available"),
+    ]
+
+    operations = [
+        migrations.RunPython(mark_grouped_students, migrations.RunPython.noop),
+    ]
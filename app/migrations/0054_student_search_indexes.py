@@ -0,0 +1,28 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:41
+
+from django.db import migrations, models
+import django.db.models.functions.text
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0053_backfill_student_is_available"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="customuser",
+            index=models.Index(
+                django.db.models.functions.text.Lower("username"),
+                name="app_customuser_uname_lower_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="student",
+            index=models.Index(
+                django.db.models.functions.text.Lower("registration_no"),
+                name="app_student_regno_lower_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,58 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:44
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0054_student_search_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="group",
+            name="comment_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="group",
+            name="last_activity_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="supervisorofstudentgroup",
+            name="final_report_document_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="supervisorofstudentgroup",
+            name="last_activity_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="supervisorofstudentgroup",
+            name="message_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="supervisorofstudentgroup",
+            name="presentation_document_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="supervisorofstudentgroup",
+            name="scope_document_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="supervisorofstudentgroup",
+            name="sdd_document_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="supervisorofstudentgroup",
+            name="srs_document_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,62 @@
+# Generated by Django 4.2.30 on 2026-10-18 03:31
+
+from django.db import migrations
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery, Value
+from django.db.models.functions import Coalesce, Greatest
+
+
+def _aggregate(queryset, aggregate):
+    return Subquery(
+        queryset.order_by()
+        .values("group")
+        .annotate(value=aggregate)
+        .values("value")[:1]
+    )
+
+
+def _count(queryset):
+    return Coalesce(
+        _aggregate(queryset, Count("id")), Value(0), output_field=IntegerField()
+    )
+
+
+def fill_counters(apps, schema_editor):
+    Group = apps.get_model("app", "Group")
+    SupervisorOfStudentGroup = apps.get_model("app", "SupervisorOfStudentGroup")
+    Document = apps.get_model("app", "Document")
+    comments = apps.get_model("app", "GroupCreationComment").objects.filter(
+        group=OuterRef("pk")
+    )
+    messages = apps.get_model("app", "ChatRoom").objects.filter(group=OuterRef("pk"))
+    documents = Document.objects.filter(group=OuterRef("pk"))
+    last_message = _aggregate(messages, Max("created_at"))
+    last_document = _aggregate(documents, Max("uploaded_at"))
+
+    Group.objects.update(
+        comment_count=_count(comments),
+        last_activity_at=_aggregate(comments, Max("created_at")),
+    )
+    SupervisorOfStudentGroup.objects.update(
+        message_count=_count(messages),
+        last_activity_at=Greatest(
+            Coalesce(last_message, last_document),
+            Coalesce(last_document, last_message),
+        ),
+        **{
+            f"{document_type}_count": _count(
+                documents.filter(document_type=document_type)
+            )
+            for document_type, _ in Document._meta.get_field("document_type").choices
+        },
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0055_activity_counters"),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_counters, migrations.RunPython.noop),
+    ]
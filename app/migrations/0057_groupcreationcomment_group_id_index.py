@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0056_backfill_activity_counters"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="groupcreationcomment",
+            index=models.Index(
+                fields=["group", "id"], name="app_groupcomment_group_id_idx"
+            ),
+        ),
+    ]
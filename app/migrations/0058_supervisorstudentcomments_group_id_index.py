@@ -0,0 +1,19 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0057_groupcreationcomment_group_id_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="supervisorstudentcomments",
+            index=models.Index(
+                fields=["group", "id"], name="app_supcomment_group_id_idx"
+            ),
+        ),
+    ]
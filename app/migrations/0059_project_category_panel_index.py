@@ -0,0 +1,20 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0058_supervisorstudentcomments_group_id_index"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="project",
+            index=models.Index(
+                fields=["project_category", "panel"],
+                name="app_project_category_panel_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 4.2.30 on 2026-10-18 03:20
+
+from django.db import OperationalError, migrations
+
+FIELDS = "project_name, project_description, language, functionalities"
+
+
+def create_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "mysql":
+        schema_editor.execute(
+            f"ALTER TABLE app_project ADD FULLTEXT INDEX app_project_fulltext ({FIELDS})"
+        )
+    elif connection.vendor == "sqlite":
+        try:
+            schema_editor.execute(
+                f"CREATE VIRTUAL TABLE app_project_fts USING fts5({FIELDS})"
+            )
+        except OperationalError:
+            # SQLite built without FTS5: project search falls back to icontains
+            return
+        schema_editor.execute(
+            f"INSERT INTO app_project_fts (rowid, {FIELDS}) "
+            f"SELECT id, {FIELDS} FROM app_project"
+        )
+
+
+def drop_search_index(apps, schema_editor):
+    connection = schema_editor.connection
+    if connection.vendor == "mysql":
+        schema_editor.execute("ALTER TABLE app_project DROP INDEX app_project_fulltext")
+    elif connection.vendor == "sqlite":
+        schema_editor.execute("DROP TABLE IF EXISTS app_project_fts")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0060_project_signatures"),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
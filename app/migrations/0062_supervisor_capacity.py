@@ -0,0 +1,26 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:55
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0061_project_fulltext_search"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="supervisor",
+            name="capacity",
+            field=models.PositiveSmallIntegerField(
+                default=5, help_text="Number of groups the supervisor can accept"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="supervisorofstudentgroup",
+            index=models.Index(
+                fields=["supervisor", "status"], name="app_sosg_supervisor_status_idx"
+            ),
+        ),
+    ]
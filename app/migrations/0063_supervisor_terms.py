@@ -0,0 +1,41 @@
+# Generated by Django 4.2.30 on 2026-10-18 02:58
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0062_supervisor_capacity"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SupervisorTerm",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=64)),
+                ("weight", models.FloatField()),
+                (
+                    "supervisor",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="terms",
+                        to="app.supervisor",
+                    ),
+                ),
+            ],
+            options={
+                "unique_together": {("term", "supervisor")},
+            },
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 4.2.30 on 2026-10-18 06:10
+
+import app.models
+from django.db import migrations
+
+BATCH_SIZE = 1000
+COLUMNS = [
+    ("app_customuser", "username_lower", 150),
+    ("app_student", "registration_no_lower", 20),
+]
+
+
+def binary_collation(apps, schema_editor):
+    # prefix ranges need code point order, which the default MySQL
+    # collations do not follow; SQLite compares with BINARY already
+    if schema_editor.connection.vendor != "mysql":
+        return
+    for table, column, length in COLUMNS:
+        schema_editor.execute(
+            f"ALTER TABLE {table} MODIFY {column} varchar({length}) "
+            "CHARACTER SET utf8mb4 COLLATE utf8mb4_bin NOT NULL"
+        )
+
+
+def fill_lowercase_copies(apps, schema_editor):
+    for model_name, field, source in [
+        ("CustomUser", "username_lower", "username"),
+        ("Student", "registration_no_lower", "registration_no"),
+    ]:
+        model = apps.get_model("app", model_name)
+        rows = []
+        for row in model.objects.only("id", source).iterator(chunk_size=BATCH_SIZE):
+            setattr(row, field, getattr(row, source).lower())
+            rows.append(row)
+        model.objects.bulk_update(rows, [field], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("app", "0063_supervisor_terms"),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name="customuser",
+            name="app_customuser_uname_lower_idx",
+        ),
+        migrations.RemoveIndex(
+            model_name="student",
+            name="app_student_regno_lower_idx",
+        ),
+        migrations.AddField(
+            model_name="customuser",
+            name="username_lower",
+            field=app.models.LowercaseCopyField(
+                db_index=True,
+                default="",
+                editable=False,
+                max_length=150,
+                source="username",
+            ),
+            preserve_default=False,
+        ),
+        migrations.AddField(
+            model_name="student",
+            name="registration_no_lower",
+            field=app.models.LowercaseCopyField(
+                db_index=True,
+                default="",
+                editable=False,
+                max_length=20,
+                source="registration_no",
+            ),
+            preserve_default=False,
+        ),
+        migrations.RunPython(binary_collation, migrations.RunPython.noop),
+        migrations.RunPython(fill_lowercase_copies, migrations.RunPython.noop),
+    ]
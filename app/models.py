@@ -1,8 +1,58 @@
-from django.db import models
+from django.db import connections, models, transaction
 from django.contrib.auth.models import AbstractUser
+from django.db.models import (
+    Case,
+    Count,
+    Exists,
+    F,
+    IntegerField,
+    OuterRef,
+    Q,
+    Subquery,
+    Value,
+    When,
+)
+from django.db.models.functions import Cast, Greatest, Lower
 from django.utils.translation import gettext_lazy as _
 
 
+class LowercaseCopyField(models.CharField):
+    """
+    Lowercase copy of the ``source`` field, refreshed whenever the row is
+    written through the ORM (``bulk_create`` included, ``update`` not). A
+    plain indexed column, unlike a ``lower()`` expression index, serves
+    range scans on every backend.
+    """
+
+    def __init__(self, *args, source, **kwargs):
+        self.source = source
+        kwargs.setdefault("editable", False)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs["source"] = self.source
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = getattr(model_instance, self.source)
+        value = value.lower() if value is not None else None
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+def with_lowercase_copies(model, update_fields):
+    """``update_fields`` plus the lowercase copies of the fields it names."""
+    if update_fields is None:
+        return None
+    copies = {
+        field.name
+        for field in model._meta.concrete_fields
+        if isinstance(field, LowercaseCopyField) and field.source in update_fields
+    }
+    return {*update_fields, *copies}
+
+
 class CustomUser(AbstractUser):
     USER_TYPE_CHOICES = (
         ("student", "Student"),
@@ -18,10 +68,137 @@ class CustomUser(AbstractUser):
             "8GsQEN$3g3MpxyFn93g3H7ID5xW+y7VriQhhpoCRoprZq4x4Wk="
         ),
     )
+    # serves the username prefix search of the student list
+    username_lower = LowercaseCopyField(
+        max_length=150, db_index=True, source="username"
+    )
+    # bumped whenever the role profile behind issued tokens may have changed
+    profile_version = models.PositiveIntegerField(default=0, editable=False)
+
+    PROFILE_RELATIONS = (
+        "student_profile",
+        "supervisor_profile",
+        "committee_member_profile",
+    )
+
+    class Meta(AbstractUser.Meta):
+        indexes = [
+            # serves the case-insensitive email lookup of the login views
+            models.Index(Lower("email"), name="app_customuser_email_lower_idx"),
+        ]
 
     def __str__(self):
         return self.username
 
+    def save(self, *args, **kwargs):
+        bump_version = self.pk is not None
+        kwargs["update_fields"] = with_lowercase_copies(
+            CustomUser, kwargs.get("update_fields")
+        )
+        if bump_version:
+            self.profile_version = models.F("profile_version") + 1
+            if kwargs["update_fields"] is not None:
+                kwargs["update_fields"].add("profile_version")
+        super().save(*args, **kwargs)
+        if bump_version:
+            self.refresh_from_db(fields=["profile_version"])
+
+    @property
+    def student(self):
+        return getattr(self, "student_profile", None)
+
+    @property
+    def supervisor(self):
+        return getattr(self, "supervisor_profile", None)
+
+    @property
+    def committee_member(self):
+        return getattr(self, "committee_member_profile", None)
+
+    @property
+    def student_id(self):
+        return self.student.id if self.student else None
+
+    @property
+    def supervisor_id(self):
+        return self.supervisor.id if self.supervisor else None
+
+    @property
+    def committee_member_id(self):
+        return self.committee_member.id if self.committee_member else None
+
+    @classmethod
+    def bump_profile_version(cls, user_id):
+        cls.objects.filter(pk=user_id).update(
+            profile_version=models.F("profile_version") + 1
+        )
+
+
+class StudentQuerySet(models.QuerySet):
+    def with_group_ids(self):
+        """
+        Annotates each student with the id of their accepted group
+        (``accepted_group_id``) and of that group's accepted supervisor
+        request (``accepted_supervision_id``), so serializers need no extra
+        query per student.
+        """
+        accepted_groups = GroupMembership.objects.filter(
+            student=OuterRef("pk"), status="accepted"
+        ).order_by("group_id")
+        accepted_supervisions = SupervisorOfStudentGroup.objects.filter(
+            group__memberships__student=OuterRef("pk"), status="accepted"
+        ).order_by("id")
+        return self.annotate(
+            accepted_group_id=Subquery(accepted_groups.values("group_id")[:1]),
+            accepted_supervision_id=Subquery(accepted_supervisions.values("id")[:1]),
+        )
+
+    def search(self, term):
+        """
+        Students whose registration number or username starts with ``term``
+        or whose email contains it, case-insensitively, best matches first.
+
+        The prefix matches are ranges over the indexed lowercase copies,
+        whose collation orders by code point (``utf8mb4_bin`` on MySQL), so
+        the range holds every string starting with ``term``; each match is
+        collected by its own subquery so one unindexable email substring
+        does not turn the whole filter into a table scan.
+        """
+        term = term.strip().lower()
+        if not term:
+            return self
+        # every string starting with term sorts in [term, upper)
+        upper = term[:-1] + chr(ord(term[-1]) + 1)
+        by_registration_no = Student.objects.filter(
+            registration_no_lower__gte=term, registration_no_lower__lt=upper
+        )
+        by_username = CustomUser.objects.filter(
+            username_lower__gte=term, username_lower__lt=upper
+        )
+        by_email = CustomUser.objects.filter(email__icontains=term)
+
+        registration_no = Q(pk__in=by_registration_no.values("pk"))
+        username = Q(user__in=by_username.values("pk"))
+        return (
+            self.filter(registration_no | username | Q(user__in=by_email.values("pk")))
+            .annotate(
+                search_rank=Case(
+                    When(registration_no_lower=term, then=Value(0)),
+                    When(registration_no, then=Value(1)),
+                    When(username, then=Value(2)),
+                    default=Value(3),
+                )
+            )
+            .order_by("search_rank", "id")
+        )
+
+    def refresh_availability(self):
+        """Recomputes ``is_available`` from the students' memberships."""
+        accepted = GroupMembership.objects.filter(
+            student=OuterRef("pk"), status="accepted"
+        )
+        return self.update(is_available=~Exists(accepted))
+
 
 class Student(models.Model):
     SEMESTER_CHOICES = (
@@ -34,15 +211,39 @@ class Student(models.Model):
     )
 
     registration_no = models.CharField(max_length=20, unique=True)
+    # serves the registration number prefix search
+    registration_no_lower = LowercaseCopyField(
+        max_length=20, db_index=True, source="registration_no"
+    )
     department = models.CharField(max_length=100, blank=True, null=True)
     semester = models.CharField(
         max_length=100, choices=SEMESTER_CHOICES, blank=True, null=True
     )
     batch_no = models.CharField(max_length=100, blank=True, null=True)
+    # False while the student is in an accepted group; kept in step with
+    # GroupMembership by Group and GroupQuerySet
+    is_available = models.BooleanField(default=True, editable=False)
+
+    objects = StudentQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # classmates still looking for a group mate
+            models.Index(
+                fields=["department", "batch_no", "semester", "is_available"],
+                name="app_student_cohort_idx",
+            ),
+        ]
 
     def __str__(self):
         return self.user.username
 
+    def save(self, *args, **kwargs):
+        kwargs["update_fields"] = with_lowercase_copies(
+            Student, kwargs.get("update_fields")
+        )
+        super().save(*args, **kwargs)
+
 
 class ProjectCategories(models.Model):
     category_name = models.CharField(max_length=100)
@@ -51,6 +252,31 @@ class ProjectCategories(models.Model):
         return self.category_name
 
 
+class SupervisorQuerySet(models.QuerySet):
+    def with_load(self):
+        """
+        Annotates each supervisor with ``accepted_groups``, ``pending_requests``
+        (requests still awaiting a student or the supervisor) and
+        ``remaining_capacity``, counted in the same query as the list.
+        """
+        return self.annotate(
+            accepted_groups=Count(
+                "group_request", filter=Q(group_request__status="accepted")
+            ),
+            pending_requests=Count(
+                "group_request",
+                filter=Q(
+                    group_request__status__in=SupervisorOfStudentGroup.PENDING_STATUSES
+                ),
+            ),
+            # signed first: capacity is unsigned on MySQL, where subtracting
+            # more accepted groups than capacity is an out-of-range error
+            remaining_capacity=Greatest(
+                Cast("capacity", IntegerField()) - F("accepted_groups"), Value(0)
+            ),
+        )
+
+
 class Supervisor(models.Model):
     user = models.OneToOneField(
         CustomUser, on_delete=models.CASCADE, related_name="supervisor_profile"
@@ -58,16 +284,91 @@ class Supervisor(models.Model):
     supervisor_id = models.CharField(max_length=100, unique=True)
     research_interest = models.CharField(max_length=255, blank=True, null=True)
     academic_background = models.CharField(max_length=255, blank=True, null=True)
+    capacity = models.PositiveSmallIntegerField(
+        default=5, help_text="Number of groups the supervisor can accept"
+    )
 
     category = models.ManyToManyField(
         ProjectCategories, related_name="supervisor", blank=True
     )
 
+    objects = SupervisorQuerySet.as_manager()
+
     def __str__(self):
         return self.user.username
 
 
-class Group(models.Model):
+class SupervisorTerm(models.Model):
+    """
+    One entry of a supervisor's TF-IDF vector over their research interest,
+    academic background and categories, maintained by app.recommendations.
+    """
+
+    supervisor = models.ForeignKey(
+        Supervisor, on_delete=models.CASCADE, related_name="terms"
+    )
+    term = models.CharField(max_length=64)
+    weight = models.FloatField()
+
+    class Meta:
+        # term first: recommendations look up the supervisors of given terms
+        unique_together = ("term", "supervisor")
+
+    def __str__(self):
+        return f"{self.supervisor_id} - {self.term}"
+
+
+class CounterFieldsModel(models.Model):
+    """
+    Base for models with counter columns that are only changed through
+    ``F()`` updates (see app/signals.py). Saving an existing instance
+    without ``update_fields`` leaves the counters out, so a stale copy in
+    memory cannot overwrite them.
+    """
+
+    counter_fields = ()
+
+    class Meta:
+        abstract = True
+
+    def save(self, *args, **kwargs):
+        if (
+            not self._state.adding
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.concrete_fields
+                if not field.primary_key and field.name not in self.counter_fields
+            ]
+        super().save(*args, **kwargs)
+
+
+class GroupQuerySet(models.QuerySet):
+    def accepted_for(self, student):
+        """The accepted group ``student`` (a Student or its id) belongs to."""
+        return self.filter(memberships__student=student, memberships__status="accepted")
+
+    def update_status(self, status):
+        """
+        Bulk status change that keeps ``GroupMembership`` in step, since
+        ``update()`` bypasses ``Group.save``.
+        """
+        with transaction.atomic():
+            # ids are read first: MySQL cannot update a table that the
+            # filter selects from (e.g. filters on memberships)
+            group_ids = list(self.values_list("id", flat=True))
+            memberships = GroupMembership.objects.filter(group_id__in=group_ids)
+            student_ids = list(memberships.values_list("student_id", flat=True))
+            memberships.update(
+                status=status, accepted_slot=GroupMembership.slot_for(status)
+            )
+            Student.objects.filter(pk__in=student_ids).refresh_availability()
+            return Group.objects.filter(id__in=group_ids).update(status=status)
+
+
+class Group(CounterFieldsModel):
     STATUS_CHOICES = (
         ("pending", "Pending"),
         ("accepted", "Accepted"),
@@ -84,13 +385,103 @@ class Group(models.Model):
     project_category = models.ForeignKey(
         ProjectCategories, on_delete=models.CASCADE, related_name="groupmate_project"
     )
+    comment_count = models.PositiveIntegerField(default=0, editable=False)
+    last_activity_at = models.DateTimeField(null=True, blank=True, editable=False)
 
-    class Meta:
-        unique_together = ("student_1", "student_2", "id")
+    counter_fields = ("comment_count", "last_activity_at")
+
+    objects = GroupQuerySet.as_manager()
 
     def __str__(self):
         return f"{self.student_1} - {self.student_2} - {self.status}"
 
+    def save(self, *args, **kwargs):
+        created = self.pk is None
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            members = Student.objects.filter(
+                pk__in=[self.student_1_id, self.student_2_id]
+            )
+            if created:
+                GroupMembership.objects.bulk_create(
+                    [
+                        GroupMembership(
+                            student_id=student_id,
+                            group=self,
+                            status=self.status,
+                            accepted_slot=(
+                                student_id if self.status == "accepted" else None
+                            ),
+                        )
+                        for student_id in {self.student_1_id, self.student_2_id}
+                    ]
+                )
+                if self.status == "accepted":
+                    members.refresh_availability()
+            elif self.memberships.exclude(status=self.status).update(
+                status=self.status,
+                accepted_slot=GroupMembership.slot_for(self.status),
+            ):
+                members.refresh_availability()
+
+    def accept(self):
+        """
+        Accepts a pending request with one conditional write per table.
+        Returns False if the request is no longer pending and raises
+        ``IntegrityError`` if either student already has an accepted group.
+        """
+        with transaction.atomic():
+            if not Group.objects.filter(pk=self.pk, status="pending").update(
+                status="accepted"
+            ):
+                return False
+            self.memberships.update(
+                status="accepted", accepted_slot=GroupMembership.slot_for("accepted")
+            )
+            Student.objects.filter(
+                pk__in=[self.student_1_id, self.student_2_id]
+            ).update(is_available=False)
+        self.status = "accepted"
+        return True
+
+
+class GroupMembership(models.Model):
+    """
+    One row per student of a ``Group``, mirroring the group's status, so a
+    student's groups are found through one indexed column instead of
+    ``student_1 OR student_2``.
+    """
+
+    student = models.ForeignKey(
+        Student, on_delete=models.CASCADE, related_name="memberships"
+    )
+    group = models.ForeignKey(
+        Group, on_delete=models.CASCADE, related_name="memberships"
+    )
+    status = models.CharField(
+        max_length=20, choices=Group.STATUS_CHOICES, default="pending"
+    )
+    # the student id while the membership is accepted, NULL otherwise; being
+    # unique, it lets the database refuse a second accepted group per student
+    accepted_slot = models.PositiveBigIntegerField(
+        unique=True, null=True, blank=True, editable=False
+    )
+
+    class Meta:
+        unique_together = ("student", "group")
+        indexes = [
+            models.Index(
+                fields=["student", "status"], name="app_membership_student_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.student} - {self.group_id} - {self.status}"
+
+    @staticmethod
+    def slot_for(status):
+        return models.F("student_id") if status == "accepted" else None
+
 
 class GroupCreationComment(models.Model):
     group = models.ForeignKey(Group, on_delete=models.CASCADE, related_name="comments")
@@ -100,6 +491,11 @@ class GroupCreationComment(models.Model):
     comment = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["group", "id"], name="app_groupcomment_group_id_idx"),
+        ]
+
     def __str__(self):
         return f"{self.student} - {self.comment}"
 
@@ -134,10 +530,44 @@ class Project(models.Model):
         blank=True,
     )
 
+    class Meta:
+        indexes = [
+            # project selection filters by category and panel
+            models.Index(
+                fields=["project_category", "panel"],
+                name="app_project_category_panel_idx",
+            ),
+        ]
+
     def __str__(self):
         return f"{self.project_name} - {self.project_category}"
 
 
+class ProjectSignature(models.Model):
+    """MinHash signature of a project's text, maintained by app.similarity."""
+
+    project = models.OneToOneField(
+        Project, on_delete=models.CASCADE, primary_key=True, related_name="signature"
+    )
+    signature = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"signature of {self.project_id}"
+
+
+class ProjectSignatureBucket(models.Model):
+    """One LSH band of a project's signature, hashed to a bucket key."""
+
+    project = models.ForeignKey(
+        Project, on_delete=models.CASCADE, related_name="signature_buckets"
+    )
+    key = models.BigIntegerField(db_index=True)
+
+    def __str__(self):
+        return f"{self.project_id} - {self.key}"
+
+
 class ScopeDocumentEvaluationCriteria(models.Model):
     STATUS_CHOICES = (
         ("pending", "Pending"),
@@ -687,7 +1117,7 @@ class Evaluation4CommitteeMember(models.Model):
         return f"committee_member_eval_{self.id}"
 
 
-class SupervisorOfStudentGroup(models.Model):
+class SupervisorOfStudentGroup(CounterFieldsModel):
     STATUS_CHOICES = (
         ("pending", "Pending"),
         ("accepted_by_student", "Accepted by Student"),
@@ -695,6 +1125,8 @@ class SupervisorOfStudentGroup(models.Model):
         ("rejected", "Rejected"),
         ("canceled", "Canceled"),
     )
+    PENDING_STATUSES = ("pending", "accepted_by_student")
+
     group = models.ForeignKey(
         Group, on_delete=models.CASCADE, related_name="supervisor_request"
     )
@@ -772,40 +1204,101 @@ class SupervisorOfStudentGroup(models.Model):
         blank=True,
         null=True,
     )
+    message_count = models.PositiveIntegerField(default=0, editable=False)
+    scope_document_count = models.PositiveIntegerField(default=0, editable=False)
+    srs_document_count = models.PositiveIntegerField(default=0, editable=False)
+    sdd_document_count = models.PositiveIntegerField(default=0, editable=False)
+    final_report_document_count = models.PositiveIntegerField(default=0, editable=False)
+    presentation_document_count = models.PositiveIntegerField(default=0, editable=False)
+    last_activity_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    EVALUATION_FORMS = (
+        ("Scope_document_evaluation_form", ScopeDocumentEvaluationCriteria),
+        ("srs_evaluation_supervisor", SRSEvaluationSupervisor),
+        ("srs_evaluation_committee_member", SRSEvaluationCommitteeMember),
+        ("sdd_evaluation_supervisor", SDDEvaluationSupervisor),
+        ("sdd_evaluation_committee_member", SDDEvaluationCommitteeMember),
+        ("evaluation3_supervisor", Evaluation3Supervisor),
+        ("evaluation3_committee_member", Evaluation3CommitteeMember),
+        ("evaluation4_supervisor", Evaluation4Supervisor),
+        ("evaluation4_committee_member", Evaluation4CommitteeMember),
+    )
+
+    counter_fields = (
+        "message_count",
+        "scope_document_count",
+        "srs_document_count",
+        "sdd_document_count",
+        "final_report_document_count",
+        "presentation_document_count",
+        "last_activity_at",
+    )
+
+    @staticmethod
+    def document_count_field(document_type):
+        return f"{document_type}_count"
+
+    @classmethod
+    def create_evaluation_forms(cls, requests):
+        """
+        Gives ``requests`` their missing evaluation forms, one INSERT per form
+        type for all of them. The forms are assigned, the requests not saved.
+        """
+        for field, form_model in cls.EVALUATION_FORMS:
+            missing = [
+                request
+                for request in requests
+                if getattr(request, f"{field}_id") is None
+            ]
+            if not missing:
+                continue
+            if connections[
+                form_model.objects.db
+            ].features.can_return_rows_from_bulk_insert:
+                forms = form_model.objects.bulk_create(form_model() for _ in missing)
+            else:
+                # without ids back from a bulk insert (MySQL) forms are
+                # created one by one
+                forms = [form_model.objects.create() for _ in missing]
+            for request, form in zip(missing, forms):
+                setattr(request, field, form)
 
     def save(self, *args, **kwargs):
-        if not self.Scope_document_evaluation_form:
-            self.Scope_document_evaluation_form = (
-                ScopeDocumentEvaluationCriteria.objects.create()
-            )
-        if not self.srs_evaluation_supervisor:
-            self.srs_evaluation_supervisor = SRSEvaluationSupervisor.objects.create()
-        if not self.srs_evaluation_committee_member:
-            self.srs_evaluation_committee_member = (
-                SRSEvaluationCommitteeMember.objects.create()
-            )
-        if not self.sdd_evaluation_supervisor:
-            self.sdd_evaluation_supervisor = SDDEvaluationSupervisor.objects.create()
-        if not self.sdd_evaluation_committee_member:
-            self.sdd_evaluation_committee_member = (
-                SDDEvaluationCommitteeMember.objects.create()
-            )
-        if not self.evaluation3_supervisor:
-            self.evaluation3_supervisor = Evaluation3Supervisor.objects.create()
-        if not self.evaluation3_committee_member:
-            self.evaluation3_committee_member = (
-                Evaluation3CommitteeMember.objects.create()
+        # forms are only needed once the supervisor accepted the group, so
+        # pending, rejected and canceled requests are a single row
+        if self.status != "accepted":
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            # the rows AssignmentPlan.apply locks, in its order, so that an
+            # accept cannot slip in between its checks and its writes
+            list(
+                Group.objects.select_for_update()
+                .filter(pk=self.group_id)
+                .values_list("id", flat=True)
             )
-        if not self.evaluation4_supervisor:
-            self.evaluation4_supervisor = Evaluation4Supervisor.objects.create()
-        if not self.evaluation4_committee_member:
-            self.evaluation4_committee_member = (
-                Evaluation4CommitteeMember.objects.create()
+            list(
+                Supervisor.objects.select_for_update()
+                .filter(pk=self.supervisor_id)
+                .values_list("id", flat=True)
             )
-        super().save(*args, **kwargs)
+            missing = [
+                field
+                for field, _ in self.EVALUATION_FORMS
+                if getattr(self, f"{field}_id") is None
+            ]
+            self.create_evaluation_forms([self])
+            if missing and kwargs.get("update_fields") is not None:
+                kwargs["update_fields"] = {*kwargs["update_fields"], *missing}
+            super().save(*args, **kwargs)
 
     class Meta:
         unique_together = ("group", "supervisor")
+        indexes = [
+            # supervisor load counts requests per supervisor and status
+            models.Index(
+                fields=["supervisor", "status"], name="app_sosg_supervisor_status_idx"
+            ),
+        ]
 
     def __str__(self):
         return f"{self.group} - {self.supervisor} - {self.status}"
@@ -839,6 +1332,11 @@ class SupervisorStudentComments(models.Model):
     )
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["group", "id"], name="app_supcomment_group_id_idx"),
+        ]
+
     def __str__(self):
         return f"{self.supervisor} - {self.student} - {self.comment}"
 
@@ -1,6 +1,102 @@
-from rest_framework.pagination import PageNumberPagination
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(CursorPagination):
+    """
+    Cursor pagination over a stable ordering, ``id`` unless the view sets
+    ``cursor_ordering``. Each page is a range scan from the cursor, so deep
+    pages cost the same as the first one and no total count is run.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    ordering = ("id",)
+
+    def get_ordering(self, request, queryset, view):
+        ordering = getattr(view, "cursor_ordering", self.ordering)
+        if isinstance(ordering, str):
+            return (ordering,)
+        return tuple(ordering)
 
 
 class BasePagination(PageNumberPagination):
+    """
+    Page number pagination with two opt-ins:
+
+    * ``?pagination=cursor`` (or a ``cursor`` parameter, or
+      ``pagination_mode = "cursor"`` on the view) switches to
+      ``KeysetPagination``; ``pagination_mode = "page"`` rules it out;
+    * ``?count=false`` skips the ``COUNT(*)``; the response then only has
+      ``next``, ``previous`` and ``results``.
+    """
+
     page_size = 10
     page_size_query_param = "page_size"
+    mode_query_param = "pagination"
+    count_query_param = "count"
+    keyset_class = KeysetPagination
+
+    def use_keyset(self, request, view):
+        mode = getattr(view, "pagination_mode", None)
+        if mode is not None:
+            return mode == "cursor"
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        self.page = None
+        if self.use_keyset(request, view):
+            self.keyset = self.keyset_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        if request.query_params.get(self.count_query_param) == "false":
+            return self.paginate_without_count(queryset, request)
+        return super().paginate_queryset(queryset, request, view)
+
+    def paginate_without_count(self, queryset, request):
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+        try:
+            self.number = int(request.query_params.get(self.page_query_param, 1))
+            if self.number < 1:
+                raise ValueError()
+        except ValueError:
+            raise NotFound(self.invalid_page_message)
+
+        start = (self.number - 1) * page_size
+        # one extra row tells whether there is a next page
+        end = start + page_size + 1
+        rows = list(queryset[start:end])
+        self.has_next = len(rows) > page_size
+        self.request = request
+        return rows[:page_size]
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        if self.page is None:
+            return Response(
+                {
+                    "next": self.get_uncounted_link(self.number + 1)
+                    if self.has_next
+                    else None,
+                    "previous": self.get_uncounted_link(self.number - 1)
+                    if self.number > 1
+                    else None,
+                    "results": data,
+                }
+            )
+        return super().get_paginated_response(data)
+
+    def get_uncounted_link(self, number):
+        url = self.request.build_absolute_uri()
+        if number == 1:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, number)
@@ -0,0 +1,96 @@
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "app_project_fts"
+SEARCH_FIELDS = ["project_name", "project_description", "language", "functionalities"]
+
+_WORD = re.compile(r"\w+")
+_fts_tables = {}
+
+
+def _has_fts_table():
+    """Whether the SQLite FTS5 table was created (FTS5 may not be compiled in)."""
+    name = connection.settings_dict["NAME"]
+    if name not in _fts_tables:
+        _fts_tables[name] = FTS_TABLE in connection.introspection.table_names()
+    return _fts_tables[name]
+
+
+def _uses_fts5():
+    return connection.vendor == "sqlite" and _has_fts_table()
+
+
+def _fts5_query(text):
+    # every word must match, as a prefix so that partial words find results;
+    # quoting keeps FTS5 operators typed by users from being interpreted
+    return " ".join(f'"{word}"*' for word in _WORD.findall(text))
+
+
+def sync_project(project):
+    """Mirrors ``project`` into the FTS5 table; MySQL FULLTEXT keeps itself in sync."""
+    if not _uses_fts5():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [project.pk])
+        cursor.execute(
+            f"INSERT INTO {FTS_TABLE} (rowid, {', '.join(SEARCH_FIELDS)}) "
+            "VALUES (%s, %s, %s, %s, %s)",
+            [project.pk, *(getattr(project, field) for field in SEARCH_FIELDS)],
+        )
+
+
+def unindex_project(project_id):
+    if not _uses_fts5():
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {FTS_TABLE} WHERE rowid = %s", [project_id])
+
+
+def search_projects(queryset, text):
+    """
+    Filters ``queryset`` down to the projects matching ``text``, best match
+    first, with the relevance annotated as ``search_rank`` (higher is better).
+
+    Uses the FTS5 table on SQLite and the FULLTEXT index on MySQL; other
+    databases fall back to unranked ``icontains`` over the same fields.
+    """
+    if connection.vendor == "mysql":
+        match = (
+            f"MATCH ({', '.join(f'app_project.{field}' for field in SEARCH_FIELDS)}) "
+            "AGAINST (%s IN NATURAL LANGUAGE MODE)"
+        )
+        return (
+            queryset.annotate(search_rank=RawSQL(match, [text]))
+            .filter(search_rank__gt=0)
+            .order_by("-search_rank", "id")
+        )
+
+    if _uses_fts5():
+        query = _fts5_query(text)
+        if not query:
+            return queryset.none()
+        # bm25() is lower for better matches
+        rank = RawSQL(
+            f"SELECT -bm25({FTS_TABLE}) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = app_project.id",
+            [query],
+        )
+        matches = RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", [query]
+        )
+        return (
+            queryset.filter(id__in=matches)
+            .annotate(search_rank=rank)
+            .order_by("-search_rank", "id")
+        )
+
+    condition = Q()
+    for word in _WORD.findall(text):
+        condition &= Q(
+            *(Q(**{f"{field}__icontains": word}) for field in SEARCH_FIELDS),
+            _connector=Q.OR,
+        )
+    return queryset.filter(condition).order_by("id")
@@ -0,0 +1,78 @@
+import os
+import secrets
+import string
+from multiprocessing import Pool
+
+from django.contrib.auth.hashers import make_password
+from django.db import transaction
+from openpyxl import Workbook
+
+from .login_pool import init_hash_worker
+from .models import CustomUser
+
+PASSWORD_ALPHABET = string.ascii_letters + string.digits
+PASSWORD_LENGTH = 10
+
+CREDENTIAL_SHEET_HEADERS = ["Username", "Email", "Role", "ID", "Password"]
+
+
+def generate_password(length=PASSWORD_LENGTH):
+    return "".join(secrets.choice(PASSWORD_ALPHABET) for _ in range(length))
+
+
+def default_password_hash():
+    return CustomUser._meta.get_field("password").default
+
+
+def _profile_identifier(user):
+    if user.student:
+        return user.student.registration_no
+    if user.supervisor:
+        return user.supervisor.supervisor_id
+    if user.committee_member:
+        return user.committee_member.committee_id
+    return ""
+
+
+def provision_credentials(users, processes=None, batch_size=500):
+    """
+    Gives every user in ``users`` a fresh random password.
+
+    The PBKDF2 hashes are computed in a multiprocessing pool (one process per
+    core by default), so the run time scales down with the number of cores,
+    and the users are written back with a single ``bulk_update``. Returns
+    ``(user, raw_password)`` pairs for the credential sheet.
+    """
+    users = list(users)
+    if not users:
+        return []
+    passwords = [generate_password() for _ in users]
+    processes = processes or os.cpu_count() or 1
+    chunksize = max(1, len(users) // (processes * 4))
+
+    with Pool(processes=processes, initializer=init_hash_worker) as pool:
+        hashes = pool.map(make_password, passwords, chunksize=chunksize)
+
+    for user, encoded in zip(users, hashes):
+        user.password = encoded
+    with transaction.atomic():
+        CustomUser.objects.bulk_update(users, ["password"], batch_size=batch_size)
+    return list(zip(users, passwords))
+
+
+def credential_workbook(credentials):
+    workbook = Workbook()
+    worksheet = workbook.active
+    worksheet.title = "Credentials"
+    worksheet.append(CREDENTIAL_SHEET_HEADERS)
+    for user, password in credentials:
+        worksheet.append(
+            [
+                user.username,
+                user.email,
+                user.get_user_type_display(),
+                _profile_identifier(user),
+                password,
+            ]
+        )
+    return workbook
@@ -0,0 +1,156 @@
+import math
+import re
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Case, Count, F, FloatField, Sum, Value, When
+
+from .models import Supervisor, SupervisorTerm
+
+MAX_TERM_LENGTH = 64
+_WORD = re.compile(r"[^\W\d_]{3,}")
+_STOP_WORDS = frozenset(
+    """
+    and are also among based been being between both but can for from has have
+    into its more most not other our over such than that the their them then
+    there these they this those through under use used using was were what
+    when where which while who will with within would you your
+    """.split()
+)
+
+
+def terms(text: str) -> Counter:
+    """Term frequencies of ``text``: lowercased words, minus stop words."""
+    return Counter(
+        word[:MAX_TERM_LENGTH]
+        for word in _WORD.findall(text.lower())
+        if word not in _STOP_WORDS
+    )
+
+
+def supervisor_text(supervisor) -> str:
+    return " ".join(
+        filter(
+            None,
+            [
+                supervisor.research_interest,
+                supervisor.academic_background,
+                *(category.category_name for category in supervisor.category.all()),
+            ],
+        )
+    )
+
+
+def _idf(document_frequencies, documents):
+    # smoothed so that a term every supervisor has still weighs a little
+    return {
+        term: math.log((1 + documents) / (1 + frequency)) + 1
+        for term, frequency in document_frequencies.items()
+    }
+
+
+def _document_frequencies(term_list):
+    frequencies = dict.fromkeys(term_list, 0)
+    frequencies.update(
+        SupervisorTerm.objects.filter(term__in=term_list)
+        .values_list("term")
+        .annotate(count=Count("supervisor"))
+        .order_by()
+    )
+    return frequencies
+
+
+def _weights(frequencies, idf):
+    """L2-normalized TF-IDF weights, with sublinear term frequencies."""
+    weights = {
+        term: (1 + math.log(count)) * idf[term] for term, count in frequencies.items()
+    }
+    norm = math.sqrt(sum(weight * weight for weight in weights.values()))
+    return {term: weight / norm for term, weight in weights.items()} if norm else {}
+
+
+def index_supervisor(supervisor):
+    """
+    Recomputes the stored TF-IDF vector of ``supervisor``.
+
+    The IDF comes from the vectors stored at that moment, so the vectors of
+    other supervisors drift slightly as profiles change; the
+    ``index_supervisor_terms`` command rebuilds all of them consistently.
+    """
+    frequencies = terms(supervisor_text(supervisor))
+    with transaction.atomic():
+        SupervisorTerm.objects.filter(supervisor=supervisor).delete()
+        document_frequencies = _document_frequencies(list(frequencies))
+        for term in frequencies:
+            document_frequencies[term] += 1
+        idf = _idf(document_frequencies, Supervisor.objects.count())
+        SupervisorTerm.objects.bulk_create(
+            SupervisorTerm(supervisor=supervisor, term=term, weight=weight)
+            for term, weight in _weights(frequencies, idf).items()
+        )
+
+
+def index_all_supervisors():
+    supervisors = list(Supervisor.objects.prefetch_related("category"))
+    documents = {
+        supervisor.pk: terms(supervisor_text(supervisor)) for supervisor in supervisors
+    }
+    document_frequencies = Counter()
+    for frequencies in documents.values():
+        document_frequencies.update(frequencies.keys())
+    idf = _idf(document_frequencies, len(supervisors))
+
+    with transaction.atomic():
+        SupervisorTerm.objects.all().delete()
+        SupervisorTerm.objects.bulk_create(
+            (
+                SupervisorTerm(supervisor_id=supervisor_id, term=term, weight=weight)
+                for supervisor_id, frequencies in documents.items()
+                for term, weight in _weights(frequencies, idf).items()
+            ),
+            batch_size=1000,
+        )
+    return len(supervisors)
+
+
+def recommend_supervisors(text, limit=5):
+    """
+    Supervisors with capacity left whose profile best matches ``text``, as
+    ``(supervisor, score)`` pairs with the cosine similarity as score.
+
+    The dot products of every candidate are summed in one aggregate query
+    over the term index, restricted to the query's terms.
+    """
+    frequencies = terms(text)
+    if not frequencies:
+        return []
+    idf = _idf(_document_frequencies(list(frequencies)), Supervisor.objects.count())
+    query = _weights(frequencies, idf)
+
+    available = Supervisor.objects.with_load().filter(remaining_capacity__gt=0)
+    scores = list(
+        SupervisorTerm.objects.filter(
+            term__in=list(query), supervisor__in=available.values("pk")
+        )
+        .values_list("supervisor")
+        .annotate(
+            score=Sum(
+                F("weight")
+                * Case(
+                    *(
+                        When(term=term, then=Value(weight))
+                        for term, weight in query.items()
+                    ),
+                    output_field=FloatField(),
+                )
+            )
+        )
+        .order_by("-score", "supervisor")[:limit]
+    )
+
+    supervisors = (
+        Supervisor.objects.select_related("user")
+        .with_load()
+        .in_bulk([supervisor_id for supervisor_id, _ in scores])
+    )
+    return [(supervisors[supervisor_id], score) for supervisor_id, score in scores]
@@ -1,6 +1,6 @@
 # students/serializers.py
 from rest_framework import serializers
-from django.db.models import Q
+from django.db.models import Prefetch
 from app.models import (
     Student,
     Supervisor,
@@ -28,29 +28,147 @@ from app.models import (
 )
 
 
+def expand_tree(expand):
+    """
+    Parses an ``?expand=`` value: ``"group.student_1_details,project"``
+    becomes ``{"group": {"student_1_details": {}}, "project": {}}``.
+    """
+    tree = {}
+    for path in filter(None, (expand or "").split(",")):
+        node = tree
+        for name in path.strip().split("."):
+            node = node.setdefault(name, {})
+    return tree
+
+
+class ExpandableFieldsMixin:
+    """
+    The nested serializers named in ``expandable_fields`` render as primary
+    keys unless the request expands them, e.g. ``?expand=group.student_1_details``
+    for a field of a nested serializer. ``?fields=id,status`` keeps only
+    those fields in GET responses, also on serializers without nested ones.
+
+    ``get_prefetches`` gives the lookups that load what will be rendered:
+    each expanded relation, through ``expandable_prefetches`` when it needs
+    a custom ``Prefetch``, and the ``related_lookups`` every serializer on
+    the way needs (functions of the lookup prefix).
+    """
+
+    expandable_fields = ()
+    expandable_prefetches = {}
+    related_lookups = ()
+
+    def __init__(self, *args, expand=None, fields=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        if expand is None:
+            expand = expand_tree(request.query_params.get("expand")) if request else {}
+        if fields is None and request and request.method == "GET":
+            fields = request.query_params.get("fields")
+            fields = set(fields.split(",")) if fields else None
+        self.expand = expand
+        self.only_fields = fields
+
+    @staticmethod
+    def _nested(field, name):
+        """The nested serializer of ``field``, whether it is a list, its source."""
+        source = field.source or name
+        if isinstance(field, serializers.ListSerializer):
+            return field.child, True, source
+        return field, False, source
+
+    def get_fields(self):
+        fields = super().get_fields()
+        for name in self.expandable_fields:
+            nested, many, source = self._nested(fields[name], name)
+            kwargs = {"read_only": True, "many": many}
+            if source != name:
+                kwargs["source"] = source
+            if name not in self.expand:
+                fields[name] = serializers.PrimaryKeyRelatedField(**kwargs)
+                continue
+            if isinstance(nested, ExpandableFieldsMixin):
+                kwargs["expand"] = self.expand[name]
+            fields[name] = type(nested)(**kwargs)
+
+        if self.only_fields is not None:
+            fields = {
+                name: field
+                for name, field in fields.items()
+                if name in self.only_fields
+            }
+        return fields
+
+    @classmethod
+    def get_prefetches(cls, expand, prefix=""):
+        lookups = [lookup(prefix) for lookup in cls.related_lookups]
+        for name in cls.expandable_fields:
+            nested, many, source = cls._nested(cls._declared_fields[name], name)
+            path = prefix + source
+            if name in expand:
+                prefetch = cls.expandable_prefetches.get(name)
+                lookups.append(prefetch(path) if prefetch else path)
+                if isinstance(nested, ExpandableFieldsMixin):
+                    lookups.extend(nested.get_prefetches(expand[name], f"{path}__"))
+            elif many:
+                # the primary keys of a to-many relation still need a query
+                lookups.append(path)
+        return lookups
+
+    @classmethod
+    def prefetch_for(cls, queryset, request):
+        """``queryset`` with the prefetches of the request's ``?expand=``."""
+        expand = expand_tree(request.query_params.get("expand"))
+        return queryset.prefetch_related(*cls.get_prefetches(expand))
+
+
 class CustomUserSerializer(serializers.ModelSerializer):
     class Meta:
         model = CustomUser
         fields = ["id", "username", "email", "user_type"]
 
 
-class StudentProfileSerializer(serializers.ModelSerializer):
+def student_profile_prefetch(lookup):
+    """
+    Prefetch for students rendered by ``StudentProfileSerializer``: the user
+    is joined and the group ids annotated, one query for the whole page.
+    """
+    return Prefetch(
+        lookup, queryset=Student.objects.select_related("user").with_group_ids()
+    )
+
+
+def accepted_groups_prefetch(prefix=""):
+    """
+    Prefetch of the accepted supervisor requests read by
+    ``ProjectSerializer.groups_data``, optionally reached through ``prefix``.
+    """
+    return Prefetch(
+        f"{prefix}groups",
+        queryset=SupervisorOfStudentGroup.objects.filter(status="accepted").only(
+            "id", "project_id"
+        ),
+        to_attr="accepted_groups",
+    )
+
+
+class StudentProfileSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     user = CustomUserSerializer(read_only=True)
     group_id = serializers.SerializerMethodField(read_only=True)
     groupmate_id = serializers.SerializerMethodField(read_only=True)
 
     def get_group_id(self, obj):
+        if hasattr(obj, "accepted_supervision_id"):
+            return obj.accepted_supervision_id
         group = SupervisorOfStudentGroup.objects.filter(
-            Q(group__student_1=obj) | Q(group__student_2=obj),
-            status="accepted",
+            group__memberships__student=obj, status="accepted"
         ).first()
         return group.id if group else None
 
     def get_groupmate_id(self, obj):
-        group = Group.objects.filter(
-            Q(student_1=obj) | Q(student_2=obj),
-            status="accepted",
-        ).first()
+        if hasattr(obj, "accepted_group_id"):
+            return obj.accepted_group_id
+        group = Group.objects.accepted_for(obj).first()
         return group.id if group else None
 
     class Meta:
@@ -67,9 +185,11 @@ class StudentProfileSerializer(serializers.ModelSerializer):
         ]
 
 
-class SupervisorProfileSerializer(serializers.ModelSerializer):
+class SupervisorProfileSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     user = CustomUserSerializer(read_only=True)
 
+    related_lookups = (lambda prefix: f"{prefix}user",)
+
     class Meta:
         model = Supervisor
         fields = [
@@ -82,7 +202,25 @@ class SupervisorProfileSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "user", "supervisor_id"]
 
 
-class CommitteeMemberProfileSerializer(serializers.ModelSerializer):
+class SupervisorDirectorySerializer(SupervisorProfileSerializer):
+    """Supervisor with the load annotated by ``SupervisorQuerySet.with_load``."""
+
+    accepted_groups = serializers.IntegerField(read_only=True)
+    pending_requests = serializers.IntegerField(read_only=True)
+    remaining_capacity = serializers.IntegerField(read_only=True)
+
+    class Meta(SupervisorProfileSerializer.Meta):
+        fields = SupervisorProfileSerializer.Meta.fields + [
+            "capacity",
+            "accepted_groups",
+            "pending_requests",
+            "remaining_capacity",
+        ]
+
+
+class CommitteeMemberProfileSerializer(
+    ExpandableFieldsMixin, serializers.ModelSerializer
+):
     user = CustomUserSerializer(read_only=True)
 
     class Meta:
@@ -90,16 +228,18 @@ class CommitteeMemberProfileSerializer(serializers.ModelSerializer):
         fields = ["id", "user", "committee_id", "panel"]
 
 
-class PanelSerializer(serializers.ModelSerializer):
+class PanelSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = CommitteeMemberPanel
         fields = ["id", "name", "committee_member", "projects"]
         read_only_fields = ["id"]
 
 
-class ProjectCategoriesSerializer(serializers.ModelSerializer):
+class ProjectCategoriesSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     supervisor = SupervisorProfileSerializer(many=True, read_only=True)
 
+    expandable_fields = ("supervisor",)
+
     class Meta:
         model = ProjectCategories
         fields = ["id", "category_name", "supervisor"]
@@ -117,7 +257,7 @@ class GroupCategorySerializer(serializers.ModelSerializer):
         fields = ["project_category"]
 
 
-class GroupRequestSerializer(serializers.ModelSerializer):
+class GroupRequestSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     student_1 = serializers.PrimaryKeyRelatedField(
         queryset=Student.objects.all(), write_only=True
     )
@@ -132,10 +272,16 @@ class GroupRequestSerializer(serializers.ModelSerializer):
     project_category_details = ProjectCategoriesSerializer(
         read_only=True, source="project_category"
     )
-    comment_count = serializers.SerializerMethodField(read_only=True)
 
-    def get_comment_count(self, obj):
-        return GroupCreationComment.objects.filter(group=obj.id).count()
+    expandable_fields = (
+        "student_1_details",
+        "student_2_details",
+        "project_category_details",
+    )
+    expandable_prefetches = {
+        "student_1_details": student_profile_prefetch,
+        "student_2_details": student_profile_prefetch,
+    }
 
     def validate(self, attrs):
         if attrs.get("student_1") == attrs.get("student_2"):
@@ -161,6 +307,7 @@ class GroupRequestSerializer(serializers.ModelSerializer):
             "status",
             "project_category",
             "comment_count",
+            "last_activity_at",
             "student_1_details",
             "student_2_details",
             "project_category_details",
@@ -168,9 +315,12 @@ class GroupRequestSerializer(serializers.ModelSerializer):
         read_only = ["comment_count", "status"]
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     student = StudentProfileSerializer(read_only=True)
 
+    expandable_fields = ("student",)
+    expandable_prefetches = {"student": student_profile_prefetch}
+
     class Meta:
         model = GroupCreationComment
         fields = ["id", "comment", "group", "student", "created_at"]
@@ -182,10 +332,14 @@ class CommentSerializer(serializers.ModelSerializer):
         ]  # Add 'group' and 'student'
 
 
-class ProjectSerializer(serializers.ModelSerializer):
+class ProjectSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     groups_data = serializers.SerializerMethodField(read_only=True)
 
+    related_lookups = (accepted_groups_prefetch,)
+
     def get_groups_data(self, obj):
+        if hasattr(obj, "accepted_groups"):
+            return [group.id for group in obj.accepted_groups]
         return obj.groups.filter(status="accepted").values_list(flat=True)
 
     class Meta:
@@ -204,24 +358,30 @@ class ProjectSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         request = self.context.get("request")
-        validated_data.update({"user": request.user})
+        validated_data.update({"user_id": request.user.id})
         response = super().create(validated_data=validated_data)
-        Project.objects.filter(user=request.user).exclude(pk=response.pk).delete()
+        Project.objects.filter(user_id=request.user.id).exclude(pk=response.pk).delete()
         return response
 
 
-class ScopeDocumentEvaluationCriteriaSerializer(serializers.ModelSerializer):
+class ScopeDocumentEvaluationCriteriaSerializer(
+    ExpandableFieldsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = ScopeDocumentEvaluationCriteria
         fields = "__all__"
         read_only_fields = ["id"]
 
 
-class SupervisorOfStudentGroupSerializer(serializers.ModelSerializer):
+class SupervisorOfStudentGroupSerializer(
+    ExpandableFieldsMixin, serializers.ModelSerializer
+):
     supervisor = SupervisorProfileSerializer(read_only=True)
     project = ProjectSerializer(read_only=True)
     group = GroupRequestSerializer(read_only=True)
 
+    expandable_fields = ("group", "supervisor", "project")
+
     class Meta:
         model = SupervisorOfStudentGroup
         fields = [
@@ -241,13 +401,25 @@ class SupervisorOfStudentGroupSerializer(serializers.ModelSerializer):
             "evaluation3_committee_member",
             "evaluation4_supervisor",
             "evaluation4_committee_member",
+            "message_count",
+            "scope_document_count",
+            "srs_document_count",
+            "sdd_document_count",
+            "final_report_document_count",
+            "presentation_document_count",
+            "last_activity_at",
         ]
 
 
-class SupervisorStudentModelCommentsSerializer(serializers.ModelSerializer):
+class SupervisorStudentModelCommentsSerializer(
+    ExpandableFieldsMixin, serializers.ModelSerializer
+):
     student = StudentProfileSerializer(read_only=True)
     supervisor = SupervisorProfileSerializer(read_only=True)
 
+    expandable_fields = ("student", "supervisor")
+    expandable_prefetches = {"student": student_profile_prefetch}
+
     class Meta:
         model = SupervisorStudentComments
         fields = [
@@ -262,11 +434,15 @@ class SupervisorStudentModelCommentsSerializer(serializers.ModelSerializer):
         read_only_fields = ["id", "created_at"]
 
 
-class DocumentSerializer(serializers.ModelSerializer):
+class DocumentSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     uploaded_by = StudentProfileSerializer(read_only=True)
     document_type = serializers.CharField(required=False)
     project_name = serializers.SerializerMethodField(read_only=True)
 
+    expandable_fields = ("uploaded_by",)
+    expandable_prefetches = {"uploaded_by": student_profile_prefetch}
+    related_lookups = (lambda prefix: f"{prefix}group__project",)
+
     def get_project_name(self, obj):
         return obj.group.project.project_name
 
@@ -298,7 +474,7 @@ class DocumentStatusUpdateSerializer(serializers.ModelSerializer):
         fields = ["status"]
 
 
-class TemplateSerializer(serializers.ModelSerializer):
+class TemplateSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     template_type = serializers.CharField(required=False)
 
     class Meta:
@@ -313,7 +489,9 @@ class TemplateSerializer(serializers.ModelSerializer):
         ]
 
 
-class SRSEvaluationSupervisorSerializer(serializers.ModelSerializer):
+class SRSEvaluationSupervisorSerializer(
+    ExpandableFieldsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = SRSEvaluationSupervisor
         fields = [
@@ -332,7 +510,9 @@ class SRSEvaluationSupervisorSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class SRSEvaluationCommitteeMemberSerializer(serializers.ModelSerializer):
+class SRSEvaluationCommitteeMemberSerializer(
+    ExpandableFieldsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = SRSEvaluationCommitteeMember
         fields = [
@@ -356,7 +536,9 @@ class SRSEvaluationCommitteeMemberSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class SDDEvaluationSupervisorSerializer(serializers.ModelSerializer):
+class SDDEvaluationSupervisorSerializer(
+    ExpandableFieldsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = SDDEvaluationSupervisor
         fields = [
@@ -376,7 +558,9 @@ class SDDEvaluationSupervisorSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class SDDEvaluationCommitteeMemberSerializer(serializers.ModelSerializer):
+class SDDEvaluationCommitteeMemberSerializer(
+    ExpandableFieldsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = SDDEvaluationCommitteeMember
         fields = [
@@ -397,7 +581,9 @@ class SDDEvaluationCommitteeMemberSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class Evaluation3SupervisorSerializer(serializers.ModelSerializer):
+class Evaluation3SupervisorSerializer(
+    ExpandableFieldsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Evaluation3Supervisor
         fields = [
@@ -414,7 +600,9 @@ class Evaluation3SupervisorSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class Evaluation3CommitteeMemberSerializer(serializers.ModelSerializer):
+class Evaluation3CommitteeMemberSerializer(
+    ExpandableFieldsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Evaluation3CommitteeMember
         fields = [
@@ -431,7 +619,9 @@ class Evaluation3CommitteeMemberSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class Evaluation4SupervisorSerializer(serializers.ModelSerializer):
+class Evaluation4SupervisorSerializer(
+    ExpandableFieldsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Evaluation4Supervisor
         fields = [
@@ -446,7 +636,9 @@ class Evaluation4SupervisorSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class Evaluation4CommitteeMemberSerializer(serializers.ModelSerializer):
+class Evaluation4CommitteeMemberSerializer(
+    ExpandableFieldsMixin, serializers.ModelSerializer
+):
     class Meta:
         model = Evaluation4CommitteeMember
         fields = [
@@ -463,7 +655,7 @@ class Evaluation4CommitteeMemberSerializer(serializers.ModelSerializer):
         read_only_fields = ["id"]
 
 
-class ChatRoomSerializer(serializers.ModelSerializer):
+class ChatRoomSerializer(ExpandableFieldsMixin, serializers.ModelSerializer):
     class Meta:
         model = ChatRoom
         fields = [
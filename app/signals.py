@@ -0,0 +1,166 @@
+from django.db.models import F
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .authentication import profile_versions
+from .catalog import invalidate_catalog
+from .models import (
+    ChatRoom,
+    CommitteeMember,
+    CustomUser,
+    Document,
+    Group,
+    GroupCreationComment,
+    GroupMembership,
+    Project,
+    ProjectCategories,
+    Student,
+    Supervisor,
+    SupervisorOfStudentGroup,
+)
+from .project_search import sync_project, unindex_project
+from .recommendations import index_supervisor
+from .similarity import index_projects
+
+
+@receiver(post_save, sender=CustomUser)
+def forget_profile_version(sender, instance, created, **kwargs):
+    if not created:
+        profile_versions.forget(instance.pk)
+
+
+@receiver(post_delete, sender=CustomUser)
+def forget_deleted_user(sender, instance, **kwargs):
+    # the token fast path would otherwise accept the deleted user's tokens
+    profile_versions.forget(instance.pk)
+
+
+@receiver(post_save, sender=Student)
+@receiver(post_save, sender=Supervisor)
+@receiver(post_save, sender=CommitteeMember)
+@receiver(post_delete, sender=Student)
+@receiver(post_delete, sender=Supervisor)
+@receiver(post_delete, sender=CommitteeMember)
+def bump_profile_version(sender, instance, **kwargs):
+    # only creating or removing a profile changes the ids carried in tokens
+    if kwargs.get("created", True):
+        CustomUser.bump_profile_version(instance.user_id)
+        profile_versions.forget(instance.user_id)
+        if sender.user.is_cached(instance):
+            instance.user.refresh_from_db(fields=["profile_version"])
+
+
+@receiver(post_delete, sender=GroupMembership)
+def release_student(sender, instance, **kwargs):
+    if instance.status == "accepted":
+        Student.objects.filter(pk=instance.student_id).refresh_availability()
+
+
+def _increment(model, pk, field, activity_at):
+    model.objects.filter(pk=pk).update(
+        **{field: F(field) + 1, "last_activity_at": activity_at}
+    )
+
+
+def _decrement(model, pk, field):
+    # a counter already at 0 is left alone: subtracting from it is an
+    # out-of-range error on MySQL's unsigned columns
+    model.objects.filter(pk=pk, **{f"{field}__gt": 0}).update(**{field: F(field) - 1})
+
+
+@receiver(post_save, sender=GroupCreationComment)
+def count_comment(sender, instance, created, **kwargs):
+    if created:
+        _increment(Group, instance.group_id, "comment_count", instance.created_at)
+
+
+@receiver(post_delete, sender=GroupCreationComment)
+def uncount_comment(sender, instance, **kwargs):
+    _decrement(Group, instance.group_id, "comment_count")
+
+
+@receiver(post_save, sender=ChatRoom)
+def count_message(sender, instance, created, **kwargs):
+    if created:
+        _increment(
+            SupervisorOfStudentGroup,
+            instance.group_id,
+            "message_count",
+            instance.created_at,
+        )
+
+
+@receiver(post_delete, sender=ChatRoom)
+def uncount_message(sender, instance, **kwargs):
+    _decrement(SupervisorOfStudentGroup, instance.group_id, "message_count")
+
+
+@receiver(post_save, sender=Document)
+def count_document(sender, instance, created, **kwargs):
+    if created:
+        _increment(
+            SupervisorOfStudentGroup,
+            instance.group_id,
+            SupervisorOfStudentGroup.document_count_field(instance.document_type),
+            instance.uploaded_at,
+        )
+
+
+@receiver(post_delete, sender=Document)
+def uncount_document(sender, instance, **kwargs):
+    _decrement(
+        SupervisorOfStudentGroup,
+        instance.group_id,
+        SupervisorOfStudentGroup.document_count_field(instance.document_type),
+    )
+
+
+@receiver(post_save, sender=Project)
+def index_project_signature(sender, instance, **kwargs):
+    index_projects([instance])
+
+
+@receiver(post_save, sender=Project)
+def index_project_text(sender, instance, **kwargs):
+    sync_project(instance)
+
+
+@receiver(post_delete, sender=Project)
+def unindex_project_text(sender, instance, **kwargs):
+    unindex_project(instance.pk)
+
+
+@receiver(post_save, sender=ProjectCategories)
+@receiver(post_delete, sender=ProjectCategories)
+@receiver(post_save, sender=Supervisor)
+@receiver(post_delete, sender=Supervisor)
+@receiver(m2m_changed, sender=Supervisor.category.through)
+def refresh_catalog(sender, **kwargs):
+    transaction.on_commit(invalidate_catalog)
+
+
+@receiver(post_save, sender=CustomUser)
+def refresh_catalog_supervisor(sender, instance, **kwargs):
+    if instance.user_type == "supervisor":
+        transaction.on_commit(invalidate_catalog)
+
+
+@receiver(post_save, sender=Supervisor)
+def index_supervisor_terms(sender, instance, **kwargs):
+    index_supervisor(instance)
+
+
+@receiver(m2m_changed, sender=Supervisor.category.through)
+def index_supervisor_category_terms(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        index_supervisor(instance)
+    elif pk_set:
+        # a category gained or lost supervisors; a cleared category is left
+        # to the index_supervisor_terms command
+        for supervisor in Supervisor.objects.filter(pk__in=pk_set):
+            index_supervisor(supervisor)
@@ -0,0 +1,133 @@
+import hashlib
+import random
+import re
+
+from django.db import transaction
+
+from .models import Project, ProjectSignature, ProjectSignatureBucket
+
+SHINGLE_SIZE = 3
+# 32 bands of 4 rows: pairs at ~0.5 Jaccard similarity are found with ~88%
+# probability, pairs below ~0.2 rarely share a bucket
+BANDS = 32
+ROWS = 4
+NUM_PERM = BANDS * ROWS
+
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+_rng = random.Random(7919)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _PRIME), _rng.randrange(0, _PRIME)) for _ in range(NUM_PERM)
+]
+_WORD = re.compile(r"\w+")
+
+
+def _hash(value: str) -> int:
+    return int.from_bytes(
+        hashlib.blake2b(value.encode(), digest_size=4).digest(), "big"
+    )
+
+
+def project_text(project) -> str:
+    return " ".join(
+        filter(
+            None,
+            [
+                project.project_name,
+                project.project_description,
+                project.functionalities,
+            ],
+        )
+    )
+
+
+def shingles(text: str) -> set:
+    """Hashed word ``SHINGLE_SIZE``-grams of the normalized text."""
+    words = _WORD.findall(text.lower())
+    if len(words) < SHINGLE_SIZE:
+        return {_hash(" ".join(words))} if words else set()
+    return {
+        _hash(" ".join(shingle))
+        for shingle in zip(*(words[i:] for i in range(SHINGLE_SIZE)))
+    }
+
+
+def minhash(shingle_set) -> list:
+    if not shingle_set:
+        return []
+    return [
+        min(((a * shingle + b) % _PRIME) & _MAX_HASH for shingle in shingle_set)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def band_keys(signature) -> list:
+    """One bucket key per LSH band; the band number is part of the key."""
+    keys = []
+    for band in range(BANDS):
+        start = band * ROWS
+        end = start + ROWS
+        rows = signature[start:end]
+        digest = hashlib.blake2b(
+            f"{band}:{','.join(map(str, rows))}".encode(), digest_size=8
+        ).digest()
+        # signed 64-bit so that it fits a BigIntegerField
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+
+
+def estimate_similarity(signature, other) -> float:
+    if not signature or len(signature) != len(other):
+        return 0.0
+    return sum(a == b for a, b in zip(signature, other)) / len(signature)
+
+
+def index_projects(projects):
+    """(Re)computes and stores the signatures and buckets of ``projects``."""
+    signatures = []
+    buckets = []
+    for project in projects:
+        signature = minhash(shingles(project_text(project)))
+        signatures.append(ProjectSignature(project=project, signature=signature))
+        if signature:
+            buckets.extend(
+                ProjectSignatureBucket(project=project, key=key)
+                for key in band_keys(signature)
+            )
+
+    project_ids = [signature.project_id for signature in signatures]
+    with transaction.atomic():
+        ProjectSignatureBucket.objects.filter(project_id__in=project_ids).delete()
+        ProjectSignature.objects.filter(project_id__in=project_ids).delete()
+        ProjectSignature.objects.bulk_create(signatures)
+        ProjectSignatureBucket.objects.bulk_create(buckets, batch_size=1000)
+
+
+def similar_projects(text, threshold=0.5, limit=10, exclude=None):
+    """
+    Projects whose text is estimated to be at least ``threshold`` similar
+    (Jaccard over word shingles) to ``text``, most similar first, as
+    ``(project, similarity)`` pairs.
+
+    Only projects sharing an LSH bucket with ``text`` are compared, which
+    is one indexed ``IN`` lookup however many projects exist.
+    """
+    signature = minhash(shingles(text))
+    if not signature:
+        return []
+
+    candidates = ProjectSignatureBucket.objects.filter(key__in=band_keys(signature))
+    if exclude is not None:
+        candidates = candidates.exclude(project_id=exclude)
+    matches = []
+    for candidate in ProjectSignature.objects.filter(
+        project_id__in=candidates.values("project_id")
+    ):
+        similarity = estimate_similarity(signature, candidate.signature)
+        if similarity >= threshold:
+            matches.append((candidate.project_id, similarity))
+    matches.sort(key=lambda match: (-match[1], match[0]))
+    matches = matches[:limit]
+
+    projects = Project.objects.in_bulk([project_id for project_id, _ in matches])
+    return [(projects[project_id], similarity) for project_id, similarity in matches]
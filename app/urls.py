@@ -2,6 +2,7 @@ from django.urls import path
 from .views import (
     GroupRequestView,
     StudentLoginView,
+    LoginMetricsAPIView,
     StudentsListView,
     StudentProfileView,
     ChangePasswordView,
@@ -23,6 +24,8 @@ from .views import (
     PanelAPIView,
     CommitteeMemberPanelDetailAPIView,
     ProjectDetailAPiView,
+    SimilarProjectsAPIView,
+    SupervisorRecommendationsAPIView,
     SupervisorStudentDetailAPIView,
     TemplateAPIView,
     SRSEvaluationSupervisorView,
@@ -42,6 +45,7 @@ from .views import (
 urlpatterns = [
     path("student/login/", StudentLoginView.as_view(), name="student-login"),
     path("student/profile/", StudentProfileView.as_view(), name="student-profile"),
+    path("login/metrics/", LoginMetricsAPIView.as_view(), name="login-metrics"),
     path(
         "supervisor/login/", SupervisorLoginAPIView.as_view(), name="supervisor-login"
     ),
@@ -170,6 +174,16 @@ urlpatterns = [
         ProjectDetailAPiView.as_view(),
         name="project-detail",
     ),
+    path(
+        "project/<int:pk>/similar/",
+        SimilarProjectsAPIView.as_view(),
+        name="project-similar",
+    ),
+    path(
+        "project/<int:pk>/supervisors/",
+        SupervisorRecommendationsAPIView.as_view(),
+        name="project-supervisor-recommendations",
+    ),
     path(
         "supervisor-student/<int:pk>/",
         SupervisorStudentDetailAPIView.as_view(),
@@ -1,9 +1,19 @@
+import hashlib
+from functools import partial
+
 from .paginators import BasePagination
 from rest_framework.status import HTTP_400_BAD_REQUEST
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework_simplejwt.authentication import JWTAuthentication
-from rest_framework.permissions import IsAuthenticated
+from .authentication import (
+    DuplicateEmailError,
+    ProfileJWTAuthentication,
+    find_login_user,
+    find_student_login_user,
+    profile_claims,
+)
+from rest_framework.authentication import SessionAuthentication
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.generics import (
     ListAPIView,
@@ -13,14 +23,21 @@ from rest_framework.generics import (
 )
 
 from rest_framework import status
-from django.http import HttpResponse
+from django.http import Http404, HttpResponse
+from django.utils.cache import get_conditional_response
 from openpyxl import Workbook
 
-from django.shortcuts import get_object_or_404
-
 from django.db.models import Q
 from datetime import datetime, timedelta
 from django.conf import settings
+from .catalog import get_catalog
+from .group_transitions import (
+    GroupTransitionError,
+    accept_group_request,
+    cancel_group_request,
+    reject_group_request,
+)
+from .login_pool import LoginPoolBusy, login_pool
 from .models import (
     Student,
     Supervisor,
@@ -45,7 +62,11 @@ from .models import (
     Evaluation4CommitteeMember,
     ChatRoom,
 )
+from .project_search import search_projects
+from .recommendations import recommend_supervisors
+from .similarity import project_text, similar_projects
 from app.serializers.serializers import (
+    SupervisorDirectorySerializer,
     SupervisorStudentModelCommentsSerializer,
     CommentSerializer,
     ProjectCategoriesSerializer,
@@ -71,6 +92,7 @@ from app.serializers.serializers import (
     Evaluation4SupervisorSerializer,
     Evaluation4CommitteeMemberSerializer,
     ChatRoomSerializer,
+    ExpandableFieldsMixin,
 )
 from .serializers.field_serializers import (
     ChangePasswordDetailSerializer,
@@ -84,7 +106,8 @@ from .serializers.field_serializers import (
 
 def get_tokens_for_user(user):
     refresh = RefreshToken.for_user(user)
-    refresh["user_type"] = user.user_type
+    for claim, value in profile_claims(user).items():
+        refresh[claim] = value
 
     return {
         "refresh": str(refresh),
@@ -95,8 +118,22 @@ def get_tokens_for_user(user):
     }
 
 
+class ExpandableQuerysetMixin:
+    """
+    Prefetches what the view's serializer renders for the request's
+    ``?expand=``, see ``ExpandableFieldsMixin``.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        serializer_class = self.get_serializer_class()
+        if issubclass(serializer_class, ExpandableFieldsMixin):
+            queryset = serializer_class.prefetch_for(queryset, self.request)
+        return queryset
+
+
 class ChangePasswordView(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -117,44 +154,99 @@ class ChangePasswordView(APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class StudentLoginView(APIView):
+class LoginAPIView(APIView):
+    """
+    Base for the login views. The password hash is verified in the bounded
+    login pool, and when that pool is saturated the client gets a fast 503
+    instead of queueing behind other logins. Subclasses set the serializer,
+    the ``login_field`` of its validated data that names the account, and
+    ``find_user``, which resolves that value to a user or None.
+    """
+
     def post(self, request):
-        serializer = StudentLoginDetailSerializer(data=request.data)
-        if serializer.is_valid():
-            student = Student.objects.filter(
-                registration_no=serializer.validated_data.get("registration_no")
-            ).first()
-            if student and student.user.check_password(
-                serializer.validated_data.get("password")
-            ):
-                token = get_tokens_for_user(student.user)
-                return Response(token, status=status.HTTP_200_OK)
-            else:
-                return Response({"message": "Invalid credentials"}, status=401)
-        else:
+        serializer = self.serializer_class(data=request.data)
+        if not serializer.is_valid():
             return Response(serializer.errors, status=HTTP_400_BAD_REQUEST)
+        try:
+            user = self.find_user(serializer.validated_data.get(self.login_field))
+        except DuplicateEmailError:
+            return Response(
+                {
+                    "message": "More than one account uses this email, "
+                    "please contact the administrator"
+                },
+                status=status.HTTP_409_CONFLICT,
+            )
+        if user is None:
+            return Response({"message": "Invalid credentials"}, status=401)
+        try:
+            check = login_pool.check_password(
+                user, serializer.validated_data.get("password")
+            )
+        except LoginPoolBusy:
+            return Response(
+                {"message": "Too many logins right now, please try again shortly"},
+                status=status.HTTP_503_SERVICE_UNAVAILABLE,
+                headers={"Retry-After": "1"},
+            )
+        if check.valid:
+            response = Response(get_tokens_for_user(user), status=status.HTTP_200_OK)
+        else:
+            response = Response({"message": "Invalid credentials"}, status=401)
+        response["Server-Timing"] = check.server_timing
+        return response
+
+
+class StudentLoginView(LoginAPIView):
+    serializer_class = StudentLoginDetailSerializer
+    login_field = "registration_no"
+    find_user = staticmethod(find_student_login_user)
+
+
+class LoginMetricsAPIView(APIView):
+    authentication_classes = [SessionAuthentication, ProfileJWTAuthentication]
+    permission_classes = [IsAdminUser]
+
+    def get(self, request):
+        return Response(
+            {
+                "workers": login_pool.workers,
+                "queue_limit": login_pool.queue_limit,
+                **login_pool.stats.snapshot(),
+            },
+            status=status.HTTP_200_OK,
+        )
 
 
 class StudentProfileView(RetrieveAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = StudentProfileSerializer
     queryset = Student.objects.all()
 
     def get_object(self):
-        return get_object_or_404(self.get_queryset(), user=self.request.user)
+        if self.request.user.student is None:
+            raise Http404("Student not found")
+        return self.request.user.student
 
 
 class StudentsListView(ListAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = StudentProfileSerializer
-    queryset = Student.objects.all()
+    queryset = Student.objects.select_related("user").with_group_ids()
     pagination_class = BasePagination
 
+    @property
+    def pagination_mode(self):
+        # keyset pagination would reorder ranked search results by id
+        return "page" if self.request.GET.get("search") else None
+
     def get_queryset(self):
         for_request = self.request.GET.get("for_request")
-        student = Student.objects.get(user=self.request.user)
+        student = self.request.user.student
+        if student is None:
+            return Student.objects.none()
         queryset = (
             super()
             .get_queryset()
@@ -165,122 +257,130 @@ class StudentsListView(ListAPIView):
             )
         )
         if for_request == "true":
-            queryset = queryset.exclude(
-                id__in=student.send_request.filter(status="accepted").values_list(
-                    "student_2", flat=True
-                )
-            )
-            queryset = queryset.exclude(
-                id__in=student.receive_request.filter(status="accepted").values_list(
-                    "student_1", flat=True
-                )
-            )
+            queryset = queryset.filter(is_available=True).exclude(id=student.id)
+        search = self.request.GET.get("search")
+        if search:
+            queryset = queryset.search(search)
         return queryset
 
 
 class ProjectCategoriesView(ListAPIView):
-    authentication_classes = [JWTAuthentication]
+    """
+    Serves the cached catalog from ``app.catalog``. The ETag covers the
+    catalog and the paging parameters, so unchanged pages answer 304.
+    """
+
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = ProjectCategoriesSerializer
     queryset = ProjectCategories.objects.all()
     pagination_class = BasePagination
+    # the cached catalog is a list, which keyset pagination cannot page
+    pagination_mode = "page"
 
+    def list(self, request, *args, **kwargs):
+        catalog = get_catalog()
+        params = "&".join(
+            f"{key}={value}" for key, value in sorted(request.query_params.items())
+        )
+        etag = '"{}"'.format(
+            hashlib.sha1(f"{catalog['digest']}?{params}".encode()).hexdigest()
+        )
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return not_modified
+
+        page = self.paginate_queryset(catalog["data"])
+        if page is not None:
+            response = self.get_paginated_response(page)
+        else:
+            response = Response(catalog["data"])
+        response["ETag"] = etag
+        return response
 
-class GroupRequestView(CreateAPIView, UpdateAPIView, ListAPIView):
-    authentication_classes = [JWTAuthentication]
+
+class GroupRequestView(
+    ExpandableQuerysetMixin, CreateAPIView, UpdateAPIView, ListAPIView
+):
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = GroupRequestSerializer
     queryset = Group.objects.all()
+    pagination_class = BasePagination
 
     def get_queryset(self):
         requested = self.request.GET.get("requested")
+        student_id = self.request.user.student_id
+        if student_id is None:
+            return Group.objects.none()
+        queryset = super().get_queryset().order_by("-id")
         if requested == "to":  # student sended from that student to other student
-            return super().get_queryset().filter(student_1__user=self.request.user)
+            return queryset.filter(student_1_id=student_id)
         elif requested == "from":  # student received from other student to that student
-            return super().get_queryset().filter(student_2__user=self.request.user)
-        return super().get_queryset()
+            return queryset.filter(student_2_id=student_id)
+        return queryset.filter(memberships__student=student_id)
 
     def post(self, request, *args, **kwargs):
-        try:
-            student_1 = Student.objects.get(user=request.user)
-            serializer = GroupRequestSerializer(
-                data={
-                    **request.data,
-                    "student_1": student_1.id,
-                }
-            )
-            if serializer.is_valid():
-                student_2 = serializer.validated_data.get("student_2")
-                request_status = student_2.receive_request.filter(
-                    status="accepted"
-                ).exists()
-                receive_request = student_2.receive_request.filter(
-                    status="accepted"
-                ).exists()
-                if request_status or receive_request:
-                    return Response(
-                        {"message": "You are too late to send group mate request"},
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
-                serializer.save()
-                return Response(serializer.data, status=status.HTTP_201_CREATED)
-            else:
-                return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
-        except Student.DoesNotExist:
+        student_1 = request.user.student
+        if student_1 is None:
             return Response(
                 {"message": "Student not found"}, status=status.HTTP_404_NOT_FOUND
             )
+        serializer = GroupRequestSerializer(
+            data={
+                **request.data,
+                "student_1": student_1.id,
+            },
+            context={"request": request},
+        )
+        if serializer.is_valid():
+            student_2 = serializer.validated_data.get("student_2")
+            if student_2.memberships.filter(status="accepted").exists():
+                return Response(
+                    {"message": "You are too late to send group mate request"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            serializer.save()
+            return Response(serializer.data, status=status.HTTP_201_CREATED)
+        else:
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+
+    # status changes made through app.group_transitions, which only lets
+    # the recipient accept or reject a request and the sender cancel it
+    transitions = {
+        "accepted": accept_group_request,
+        "rejected": reject_group_request,
+        "canceled": cancel_group_request,
+    }
 
     def update(self, request, *args, **kwargs):
         try:
             grouo_id = request.GET.get("pk")
             group = Group.objects.get(id=grouo_id)
-            if group.student_1.user == request.user:
+            student_id = request.user.student_id
+            request_status = request.data.get("status")
+            if request_status in self.transitions:
+                return self.transition(
+                    self.transitions[request_status], group, student_id
+                )
+            if student_id is not None and group.student_1_id == student_id:
                 serializer = GroupCategorySerializer(
                     instance=group, data=request.data, partial=True
                 )
-            else:
+            elif student_id is not None and group.student_2_id == student_id:
                 serializer = GroupStatusSerializer(
                     instance=group, data=request.data, partial=True
                 )
-                request_status = request.data.get("status")
-                if request_status == "accepted":
-                    student_1_receive_status = group.student_1.receive_request.filter(
-                        status="accepted"
-                    ).exists()
-                    student_1_send_status = group.student_1.send_request.filter(
-                        status="accepted"
-                    ).exists()
-                    if student_1_receive_status or student_1_send_status:
-                        return Response(
-                            {
-                                "message": "You are too late to accept group mate request"
-                            },
-                            status=status.HTTP_400_BAD_REQUEST,
-                        )
-                    student_2_receive_status = group.student_2.receive_request.filter(
-                        status="accepted"
-                    ).exists()
-                    student_2_send_status = group.student_2.send_request.filter(
-                        status="accepted"
-                    ).exists()
-                    if student_2_receive_status or student_2_send_status:
-                        return Response(
-                            {"message": "someone already choose you as group mate"},
-                            status=status.HTTP_400_BAD_REQUEST,
-                        )
+            else:
+                return Response(
+                    {
+                        "message": "You are not allowed to change this group mate request"
+                    },
+                    status=status.HTTP_403_FORBIDDEN,
+                )
 
             if serializer.is_valid():
                 serializer.save()
-                if serializer.data.get("status"):
-                    Group.objects.filter(
-                        ~Q(id=group.id),
-                        Q(student_1__user=request.user)
-                        | Q(student_2__user=request.user)
-                        | Q(student_1=group.student_1)
-                        | Q(student_2=group.student_1),
-                        status="pending",
-                    ).update(status="canceled")
                 return Response(serializer.data, status.HTTP_200_OK)
             else:
                 return Response(serializer.errors, status.HTTP_400_BAD_REQUEST)
@@ -290,91 +390,156 @@ class GroupRequestView(CreateAPIView, UpdateAPIView, ListAPIView):
                 status=status.HTTP_404_NOT_FOUND,
             )
 
+    def transition(self, transition, group, student_id):
+        try:
+            group = transition(group.id, student_id)
+        except GroupTransitionError as ex:
+            return Response(
+                {"message": ex.message},
+                status=(
+                    status.HTTP_403_FORBIDDEN
+                    if ex.forbidden
+                    else status.HTTP_400_BAD_REQUEST
+                ),
+            )
+        return Response(GroupStatusSerializer(group).data, status.HTTP_200_OK)
+
 
-class GetGroupRequestView(RetrieveAPIView):
-    authentication_classes = [JWTAuthentication]
+class GetGroupRequestView(ExpandableQuerysetMixin, RetrieveAPIView):
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = GroupRequestSerializer
     queryset = Group.objects.all()
 
 
-class GroupDetailView(RetrieveAPIView):
-    authentication_classes = [JWTAuthentication]
+class GroupDetailView(ExpandableQuerysetMixin, RetrieveAPIView):
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = GroupRequestSerializer
     queryset = Group.objects.all()
 
 
 class GroupComments(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     lookup_url_kwarg = "group"
     lookup_field = "group"
 
     def post(self, request, group):
-        try:
-            # Get the student and group instances
-            student = Student.objects.get(user=request.user)
-            group_instance = Group.objects.get(id=group)
-        except Student.DoesNotExist:
+        student = request.user.student
+        if student is None:
             return Response(
                 {"message": "Student not found"}, status=status.HTTP_404_NOT_FOUND
             )
+        try:
+            group_instance = Group.objects.get(id=group)
         except Group.DoesNotExist:
             return Response(
                 {"message": "Group not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
         # Initialize serializer with request data
-        serializer = CommentSerializer(data=request.data)
+        serializer = CommentSerializer(data=request.data, context={"request": request})
         if serializer.is_valid():
             # Save with the student and group instances
             serializer.save(student=student, group=group_instance)
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    default_limit = 50
+    max_limit = 200
+
     def get(self, request, group):
         try:
-            group_comments = GroupCreationComment.objects.filter(group=group)
-            serializer = CommentSerializer(group_comments, many=True)
+            group_comments = CommentSerializer.prefetch_for(
+                GroupCreationComment.objects.filter(group=group), request
+            )
+            # page through the (group, id) index from the last seen id; the
+            # first page starts from the beginning of the thread
+            try:
+                after_id = int(request.GET.get("after_id", 0))
+                limit = int(request.GET.get("limit", self.default_limit))
+            except ValueError:
+                return Response(
+                    {"message": "after_id and limit must be integers"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            limit = max(1, min(limit, self.max_limit))
+            group_comments = group_comments.filter(id__gt=after_id).order_by("id")[
+                :limit
+            ]
+            serializer = CommentSerializer(
+                group_comments, many=True, context={"request": request}
+            )
             return Response(serializer.data, status=status.HTTP_200_OK)
         except GroupCreationComment.DoesNotExist:
             return Response({"message": "No comments found"}, status=404)
 
 
-class ProjectAPIVIEW(ListAPIView, CreateAPIView):
-    authentication_classes = [JWTAuthentication]
+class ProjectAPIVIEW(ExpandableQuerysetMixin, ListAPIView, CreateAPIView):
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = ProjectSerializer
     queryset = Project.objects.all()
+    pagination_class = BasePagination
+
+    @property
+    def pagination_mode(self):
+        # keyset pagination would reorder results ranked by relevance by id
+        return "page" if self.request.GET.get("q", "").strip() else None
 
     def get_queryset(self):
-        queryset = super().get_queryset()
+        queryset = super().get_queryset().order_by("id")
         category_id = self.request.GET.get("category_id")
         if category_id:
             queryset = queryset.filter(project_category_id=category_id)
+        panel_id = self.request.GET.get("panel")
+        if panel_id:
+            queryset = queryset.filter(panel_id=panel_id)
         queryset = queryset.filter(
-            Q(panel__isnull=False) | Q(panel__isnull=True, user=self.request.user)
+            Q(panel__isnull=False) | Q(panel__isnull=True, user_id=self.request.user.id)
         )
+        search = self.request.GET.get("q", "").strip()
+        if search:
+            queryset = search_projects(queryset, search)
         return queryset
 
 
 class ListSuperisorAPIView(ListAPIView):
-    authentication_classes = [JWTAuthentication]
+    """
+    Supervisors with their load. Besides ``?category=<id>``, takes
+    ``?available=true`` (capacity left), ``?min_remaining=<n>`` and
+    ``?ordering=`` with one of ``ordering_fields``, ``-`` for descending.
+    """
+
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
-    serializer_class = SupervisorProfileSerializer
-    queryset = Supervisor.objects.all()
+    serializer_class = SupervisorDirectorySerializer
+    queryset = Supervisor.objects.select_related("user").with_load()
     pagination_class = BasePagination
+    ordering_fields = ["remaining_capacity", "accepted_groups", "pending_requests"]
 
     def get_queryset(self):
+        queryset = super().get_queryset()
         category = self.request.GET.get("category")
         if category:
-            return super().get_queryset().filter(category__id=category)
-        return super().get_queryset()
-
-
-class SendSupervisorRequestAPIView(CreateAPIView, ListAPIView, UpdateAPIView):
-    authentication_classes = [JWTAuthentication]
+            queryset = queryset.filter(category__id=category)
+        if self.request.GET.get("available") == "true":
+            queryset = queryset.filter(remaining_capacity__gt=0)
+        min_remaining = self.request.GET.get("min_remaining", "")
+        if min_remaining.isdigit():
+            queryset = queryset.filter(remaining_capacity__gte=int(min_remaining))
+
+        ordering = self.request.GET.get("ordering", "")
+        if ordering.lstrip("-") in self.ordering_fields:
+            return queryset.order_by(ordering, "id")
+        return queryset.order_by("id")
+
+
+class SendSupervisorRequestAPIView(
+    ExpandableQuerysetMixin, CreateAPIView, ListAPIView, UpdateAPIView
+):
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = SupervisorOfStudentGroupSerializer
     queryset = SupervisorOfStudentGroup.objects.all()
@@ -382,34 +547,27 @@ class SendSupervisorRequestAPIView(CreateAPIView, ListAPIView, UpdateAPIView):
 
     def get_queryset(self):
         requested = self.request.GET.get("requested")
-        try:
-            student = Student.objects.get(user=self.request.user)
-            group = Group.objects.get(
-                Q(student_1=student) | Q(student_2=student), status="accepted"
-            )
-            query_set = super().get_queryset().filter(group=group.id)
-            if requested == "to":
-                return query_set.filter(created_by__user=self.request.user)
-            elif requested == "from":
-                return query_set.exclude(created_by__user=self.request.user)
-            else:
-                return query_set
-        except Group.DoesNotExist:
-            pass
-        except Student.DoesNotExist:
-            pass
-        try:
-            return (
-                super()
-                .get_queryset()
-                .filter(
-                    supervisor__user=self.request.user,
-                    status__in=["accepted", "accepted_by_student"],
-                )
+        student_id = self.request.user.student_id
+        if student_id is not None:
+            try:
+                group = Group.objects.accepted_for(student_id).get()
+                query_set = super().get_queryset().filter(group=group.id)
+                if requested == "to":
+                    return query_set.filter(created_by_id=student_id)
+                elif requested == "from":
+                    return query_set.exclude(created_by_id=student_id)
+                else:
+                    return query_set
+            except Group.DoesNotExist:
+                pass
+        return (
+            super()
+            .get_queryset()
+            .filter(
+                supervisor_id=self.request.user.supervisor_id,
+                status__in=["accepted", "accepted_by_student"],
             )
-        except Supervisor.DoesNotExist:
-            pass
-        return super().get_queryset()
+        )
 
     def post(self, request, *args, **kwargs):
         data = request.data
@@ -424,11 +582,11 @@ class SendSupervisorRequestAPIView(CreateAPIView, ListAPIView, UpdateAPIView):
         serializer = SupervisorofStudentGroupSerializer(data=data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=HTTP_400_BAD_REQUEST)
+        student = request.user.student
+        if student is None:
+            return Response({"message": "Student not found"}, status=404)
         try:
-            student = Student.objects.get(user=request.user)
-            group = Group.objects.get(
-                Q(student_1=student) | Q(student_2=student), status="accepted"
-            )
+            group = Group.objects.accepted_for(student).get()
             supervisor = Supervisor.objects.get(
                 id=serializer.validated_data["supervisor"]
             )
@@ -442,7 +600,9 @@ class SendSupervisorRequestAPIView(CreateAPIView, ListAPIView, UpdateAPIView):
             supervisor_request = SupervisorOfStudentGroup.objects.create(
                 group=group, supervisor=supervisor, project=project, created_by=student
             )
-            serializer = SupervisorOfStudentGroupSerializer(supervisor_request)
+            serializer = SupervisorOfStudentGroupSerializer(
+                supervisor_request, context={"request": request}
+            )
             return Response(serializer.data, status=201)
         except Group.DoesNotExist:
             return Response({"message": "Group mate not found"}, status=404)
@@ -450,45 +610,41 @@ class SendSupervisorRequestAPIView(CreateAPIView, ListAPIView, UpdateAPIView):
             return Response({"message": "Supervisor not found"}, status=404)
 
     def update(self, request, *args, **kwargs):
-        response_student = None
+        response_student_id = None
         try:
             id = self.request.GET.get("pk")
-            try:
-                student = Student.objects.get(user=self.request.user)
-            except Student.DoesNotExist:
-                student = None
+            student = self.request.user.student
             if student:
                 if not id:
                     return Response(
                         {"message": "Supervisor request id not found"}, status=400
                     )
-                group = Group.objects.get(
-                    Q(student_1__user=self.request.user)
-                    | Q(student_2__user=self.request.user),
-                    status="accepted",
-                )
+                group = Group.objects.accepted_for(student).get()
                 if not group:
                     return Response({"message": "Group mate not found"}, status=404)
-                if group.student_1.user == self.request.user:
-                    response_student = group.student_2
-                elif group.student_2.user == self.request.user:
-                    response_student = group.student_1
+                if group.student_1_id == student.id:
+                    response_student_id = group.student_2_id
+                elif group.student_2_id == student.id:
+                    response_student_id = group.student_1_id
                 else:
                     return Response(
                         {"message": "You are not a member of this group"}, status=404
                     )
             supervisor_request = SupervisorOfStudentGroup.objects.get(id=id)
             if student:
-                if supervisor_request.created_by.user == self.request.user:
+                if supervisor_request.created_by_id == student.id:
                     return Response(
                         {"message": "You cannot update this request"}, status=400
                     )
-                if supervisor_request.created_by != response_student:
+                if supervisor_request.created_by_id != response_student_id:
                     return Response(
                         {"message": "You cannot update this request"}, status=400
                     )
             serializer = SupervisorOfStudentGroupSerializer(
-                instance=supervisor_request, data=request.data, partial=True
+                instance=supervisor_request,
+                data=request.data,
+                partial=True,
+                context={"request": request},
             )
             if serializer.is_valid():
                 if student:
@@ -508,55 +664,66 @@ class SendSupervisorRequestAPIView(CreateAPIView, ListAPIView, UpdateAPIView):
             )
 
 
-class SendSupervisorRequestDetailAPIView(RetrieveAPIView):
-    authentication_classes = [JWTAuthentication]
+class SendSupervisorRequestDetailAPIView(ExpandableQuerysetMixin, RetrieveAPIView):
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = SupervisorOfStudentGroupSerializer
     queryset = SupervisorOfStudentGroup.objects.all()
     pagination_class = BasePagination
 
 
-class SupervisorStudentCommentsAPIView(CreateAPIView, ListAPIView):
-    authentication_classes = [JWTAuthentication]
+class SupervisorStudentCommentsAPIView(
+    ExpandableQuerysetMixin, CreateAPIView, ListAPIView
+):
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = SupervisorStudentModelCommentsSerializer
     queryset = SupervisorStudentComments.objects.all()
 
     def get_queryset(self):
-        group_id = self.request.GET.get("group")
-        if group_id:
-            return super().get_queryset().filter(group=group_id)
-        return super().get_queryset()
+        queryset = super().get_queryset().filter(group=self.group_id).order_by("id")
+        if self.since_id is not None:
+            # incremental fetch of the comments posted after since_id
+            queryset = queryset.filter(id__gt=self.since_id)
+        return queryset
+
+    def list(self, request, *args, **kwargs):
+        try:
+            self.group_id = int(request.GET["group"])
+            since_id = request.GET.get("since_id")
+            self.since_id = int(since_id) if since_id else None
+        except KeyError:
+            return Response(
+                {"message": "group is required"}, status=status.HTTP_400_BAD_REQUEST
+            )
+        except ValueError:
+            return Response(
+                {"message": "group and since_id must be integers"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return super().list(request, *args, **kwargs)
 
     def post(self, request, *args, **kwargs):
         serializer = SupervisorStudentCommentsSerializer(data=request.data)
         if not serializer.is_valid():
             return Response(serializer.errors, status=HTTP_400_BAD_REQUEST)
-        commented_by = None
         try:
             group = Group.objects.get(id=serializer.validated_data["group"])
         except Group.DoesNotExist:
             return Response({"message": "Group not found"}, status=404)
-        try:
-            student = Student.objects.get(user=request.user)
-            commented_by = "student"
-        except Student.DoesNotExist:
-            student = None
-        try:
-            supervisor = Supervisor.objects.get(user=request.user)
-            commented_by = "supervisor"
-        except Supervisor.DoesNotExist:
-            supervisor = None
-        if not student and not supervisor:
+        student_id = request.user.student_id
+        supervisor_id = request.user.supervisor_id
+        if not student_id and not supervisor_id:
             return Response(
                 {"message": "You are not a member of this group"}, status=404
             )
+        commented_by = "supervisor" if supervisor_id else "student"
         student_supervisor_comment = SupervisorStudentComments(
             comment=serializer.validated_data["comment"],
             commented_by=commented_by,
             group=group,
-            student=student,
-            supervisor=supervisor,
+            student_id=student_id,
+            supervisor_id=supervisor_id,
         )
         student_supervisor_comment.save()
         return Response(
@@ -565,7 +732,7 @@ class SupervisorStudentCommentsAPIView(CreateAPIView, ListAPIView):
 
 
 class SupervisorResponseAPIView(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def post(self, request):
@@ -584,71 +751,63 @@ class SupervisorResponseAPIView(APIView):
                 return Response({"message": "Invalid status"}, status=400)
 
             supervisor_request.save()
-            serializer = SupervisorOfStudentGroupSerializer(supervisor_request)
+            serializer = SupervisorOfStudentGroupSerializer(
+                supervisor_request, context={"request": request}
+            )
             return Response(serializer.data, status=200)
         except SupervisorOfStudentGroup.DoesNotExist:
             return Response({"message": "Supervisor request not found"}, status=404)
 
 
-class SupervisorLoginAPIView(APIView):
-    def post(self, request):
-        serializer = SupervisorLoginDetailSerializer(data=request.data)
-        if serializer.is_valid():
-            email = serializer.validated_data.get("email")
-            supervisor = Supervisor.objects.filter(user__email=email).first()
-            if supervisor and supervisor.user.check_password(
-                serializer.validated_data.get("password")
-            ):
-                token = get_tokens_for_user(supervisor.user)
-                return Response(token, status=status.HTTP_200_OK)
-            else:
-                return Response({"message": "Invalid credentials"}, status=401)
-        else:
-            return Response(serializer.errors, status=HTTP_400_BAD_REQUEST)
+class EmailLoginAPIView(LoginAPIView):
+    """Login for roles that sign in with their email address."""
+
+    login_field = "email"
+
+
+class SupervisorLoginAPIView(EmailLoginAPIView):
+    serializer_class = SupervisorLoginDetailSerializer
+    find_user = staticmethod(partial(find_login_user, relation="supervisor_profile"))
 
 
 class SupervisorProfileView(RetrieveAPIView, UpdateAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = SupervisorProfileSerializer
     queryset = Supervisor.objects.all()
 
     def get_object(self):
-        return get_object_or_404(self.get_queryset(), user=self.request.user)
+        if self.request.user.supervisor is None:
+            raise Http404("Supervisor not found")
+        return self.request.user.supervisor
 
 
-class CommitteeMemberLoginAPIView(APIView):
-    def post(self, request):
-        serializer = CommitteeMemberLoginDetailSerializer(data=request.data)
-        if serializer.is_valid():
-            email = serializer.validated_data.get("email")
-            committee_member = CommitteeMember.objects.filter(user__email=email).first()
-            if committee_member and committee_member.user.check_password(
-                serializer.validated_data.get("password")
-            ):
-                token = get_tokens_for_user(committee_member.user)
-                return Response(token, status=status.HTTP_200_OK)
-            else:
-                return Response({"message": "Invalid credentials"}, status=401)
-        else:
-            return Response(serializer.errors, status=HTTP_400_BAD_REQUEST)
+class CommitteeMemberLoginAPIView(EmailLoginAPIView):
+    serializer_class = CommitteeMemberLoginDetailSerializer
+    find_user = staticmethod(
+        partial(find_login_user, relation="committee_member_profile")
+    )
 
 
 class CommitteeMemberProfileView(RetrieveAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = CommitteeMemberProfileSerializer
     queryset = CommitteeMember.objects.all()
 
     def get_object(self):
-        return get_object_or_404(self.get_queryset(), user=self.request.user)
+        if self.request.user.committee_member is None:
+            raise Http404("Committee member not found")
+        return self.request.user.committee_member
 
 
-class DocumentUploadAPIView(CreateAPIView, ListAPIView, UpdateAPIView):
+class DocumentUploadAPIView(
+    ExpandableQuerysetMixin, CreateAPIView, ListAPIView, UpdateAPIView
+):
     permission_classes = [IsAuthenticated]
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     serializer_class = DocumentSerializer
-    queryset = Document.objects.all()
+    queryset = Document.objects.select_related("group__project")
 
     def get_queryset(self):
         group = self.request.GET.get("group")
@@ -658,19 +817,11 @@ class DocumentUploadAPIView(CreateAPIView, ListAPIView, UpdateAPIView):
             .filter(document_type=self.kwargs.get("document_type"))
         )
         if group:
-            try:
-                Supervisor.objects.get(user=self.request.user)
+            if self.request.user.supervisor_id or self.request.user.committee_member_id:
                 return queryset.filter(
                     group=group, status__in=["accepted", "accepted_by_student"]
                 )
-            except Supervisor.DoesNotExist:
-                try:
-                    CommitteeMember.objects.get(user=self.request.user)
-                    return queryset.filter(
-                        group=group, status__in=["accepted", "accepted_by_student"]
-                    )
-                except CommitteeMember.DoesNotExist:
-                    return queryset.filter(group=group)
+            return queryset.filter(group=group)
         return queryset
 
     def create(self, request, *args, **kwargs):
@@ -685,23 +836,27 @@ class DocumentUploadAPIView(CreateAPIView, ListAPIView, UpdateAPIView):
             return Response(
                 {"message": "Invalid document type"}, status=status.HTTP_400_BAD_REQUEST
             )
+        student = self.request.user.student
+        if student is None:
+            return Response(
+                {"message": "Student not found"}, status=status.HTTP_404_NOT_FOUND
+            )
         serializer = self.get_serializer(data=request.data)
         serializer.is_valid(raise_exception=True)
-        student = Student.objects.get(user=self.request.user)
         group = SupervisorOfStudentGroup.objects.get(
-            Q(group__student_1=student) | Q(group__student_2=student),
-            status="accepted",
+            group__memberships__student=student, status="accepted"
         )
         serializer.save(uploaded_by=student, group=group, document_type=document_type)
         return Response(serializer.data, status=status.HTTP_201_CREATED)
 
     def update(self, request, *args, **kwargs):
         document_id = self.request.GET.get("pk")
+        student = self.request.user.student
+        if student is None:
+            return self.supervisor_update(request, document_id)
         try:
-            student = Student.objects.get(user=self.request.user)
             group = SupervisorOfStudentGroup.objects.get(
-                Q(group__student_1=student) | Q(group__student_2=student),
-                status="accepted",
+                group__memberships__student=student, status="accepted"
             )
             document = Document.objects.get(id=document_id, group=group.id)
             serializer = DocumentStatusUpdateSerializer(
@@ -710,7 +865,7 @@ class DocumentUploadAPIView(CreateAPIView, ListAPIView, UpdateAPIView):
             if not serializer.is_valid():
                 return Response(serializer.errors, status=HTTP_400_BAD_REQUEST)
             if (
-                document.uploaded_by == student
+                document.uploaded_by_id == student.id
                 and serializer.validated_data.get("status") == "accepted_by_student"
             ):
                 return Response(
@@ -726,217 +881,272 @@ class DocumentUploadAPIView(CreateAPIView, ListAPIView, UpdateAPIView):
             return Response(
                 {"message": "Document not found"}, status=status.HTTP_404_NOT_FOUND
             )
-        except Group.DoesNotExist:
+        except SupervisorOfStudentGroup.DoesNotExist:
             return Response(
                 {"message": "Group mate not found"}, status=status.HTTP_404_NOT_FOUND
             )
-        except Student.DoesNotExist:
-            try:
-                supervisor = Supervisor.objects.get(user=self.request.user)
-                document = Document.objects.get(
-                    id=document_id, group__supervisor=supervisor.id
-                )
-                serializer = DocumentStatusUpdateSerializer(
-                    instance=document, data=request.data, partial=True
-                )
-                if not serializer.is_valid():
-                    return Response(serializer.errors, status=HTTP_400_BAD_REQUEST)
-                serializer.save()
-                return Response(serializer.data, status=status.HTTP_200_OK)
-            except Document.DoesNotExist:
-                return Response(
-                    {"message": "Document not found"}, status=status.HTTP_404_NOT_FOUND
-                )
-            except Supervisor.DoesNotExist:
-                return Response(
-                    {"message": "Supervisor not found"},
-                    status=status.HTTP_404_NOT_FOUND,
-                )
+
+    def supervisor_update(self, request, document_id):
+        supervisor = self.request.user.supervisor
+        if supervisor is None:
+            return Response(
+                {"message": "Supervisor not found"},
+                status=status.HTTP_404_NOT_FOUND,
+            )
+        try:
+            document = Document.objects.get(
+                id=document_id, group__supervisor=supervisor.id
+            )
+        except Document.DoesNotExist:
+            return Response(
+                {"message": "Document not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        serializer = DocumentStatusUpdateSerializer(
+            instance=document, data=request.data, partial=True
+        )
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=HTTP_400_BAD_REQUEST)
+        serializer.save()
+        return Response(serializer.data, status=status.HTTP_200_OK)
 
 
 class ScopeDocumentEvaluationCriteriaView(RetrieveAPIView, UpdateAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = ScopeDocumentEvaluationCriteriaSerializer
     queryset = ScopeDocumentEvaluationCriteria.objects.all()
 
     def update(self, request, *args, **kwargs):
-        try:
-            CommitteeMember.objects.get(user=self.request.user)
-            return super().update(request, *args, **kwargs)
-        except CommitteeMember.DoesNotExist:
+        if self.request.user.committee_member_id is None:
             return Response(
                 {"message": "You are not authorized to update this document"},
                 status=status.HTTP_403_FORBIDDEN,
             )
+        return super().update(request, *args, **kwargs)
 
 
 class SRSEvaluationSupervisorView(RetrieveAPIView, UpdateAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = SRSEvaluationSupervisorSerializer
     queryset = SRSEvaluationSupervisor.objects.all()
 
     def update(self, request, *args, **kwargs):
-        try:
-            Supervisor.objects.get(user=self.request.user)
-            return super().update(request, *args, **kwargs)
-        except Supervisor.DoesNotExist:
+        if self.request.user.supervisor_id is None:
             return Response(
                 {"message": "You are not authorized to update this document"},
                 status=status.HTTP_403_FORBIDDEN,
             )
+        return super().update(request, *args, **kwargs)
 
 
 class SRSEvaluationCommitteeMemberView(RetrieveAPIView, UpdateAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = SRSEvaluationCommitteeMemberSerializer
     queryset = SRSEvaluationCommitteeMember.objects.all()
 
     def update(self, request, *args, **kwargs):
-        try:
-            CommitteeMember.objects.get(user=self.request.user)
-            return super().update(request, *args, **kwargs)
-        except CommitteeMember.DoesNotExist:
+        if self.request.user.committee_member_id is None:
             return Response(
                 {"message": "You are not authorized to update this document"},
                 status=status.HTTP_403_FORBIDDEN,
             )
+        return super().update(request, *args, **kwargs)
 
 
 class SDDEvaluationSupervisorView(RetrieveAPIView, UpdateAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = SDDEvaluationSupervisorSerializer
     queryset = SDDEvaluationSupervisor.objects.all()
 
     def update(self, request, *args, **kwargs):
-        try:
-            Supervisor.objects.get(user=self.request.user)
-            return super().update(request, *args, **kwargs)
-        except Supervisor.DoesNotExist:
+        if self.request.user.supervisor_id is None:
             return Response(
                 {"message": "You are not authorized to update this document"},
                 status=status.HTTP_403_FORBIDDEN,
             )
+        return super().update(request, *args, **kwargs)
 
 
 class SDDEvaluationCommitteeMemberView(RetrieveAPIView, UpdateAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = SDDEvaluationCommitteeMemberSerializer
     queryset = SDDEvaluationCommitteeMember.objects.all()
 
     def update(self, request, *args, **kwargs):
-        try:
-            CommitteeMember.objects.get(user=self.request.user)
-            return super().update(request, *args, **kwargs)
-        except CommitteeMember.DoesNotExist:
+        if self.request.user.committee_member_id is None:
             return Response(
                 {"message": "You are not authorized to update this document"},
                 status=status.HTTP_403_FORBIDDEN,
             )
+        return super().update(request, *args, **kwargs)
 
 
 class Evaluation3SupervisorView(RetrieveAPIView, UpdateAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = Evaluation3SupervisorSerializer
     queryset = Evaluation3Supervisor.objects.all()
 
     def update(self, request, *args, **kwargs):
-        try:
-            Supervisor.objects.get(user=self.request.user)
-            return super().update(request, *args, **kwargs)
-        except Supervisor.DoesNotExist:
+        if self.request.user.supervisor_id is None:
             return Response(
                 {"message": "You are not authorized to update this document"},
                 status=status.HTTP_403_FORBIDDEN,
             )
+        return super().update(request, *args, **kwargs)
 
 
 class Evaluation3CommitteeMemberView(RetrieveAPIView, UpdateAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = Evaluation3CommitteeMemberSerializer
     queryset = Evaluation3CommitteeMember.objects.all()
 
     def update(self, request, *args, **kwargs):
-        try:
-            CommitteeMember.objects.get(user=self.request.user)
-            return super().update(request, *args, **kwargs)
-        except CommitteeMember.DoesNotExist:
+        if self.request.user.committee_member_id is None:
             return Response(
                 {"message": "You are not authorized to update this document"},
                 status=status.HTTP_403_FORBIDDEN,
             )
+        return super().update(request, *args, **kwargs)
 
 
 class Evaluation4SupervisorView(RetrieveAPIView, UpdateAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = Evaluation4SupervisorSerializer
     queryset = Evaluation4Supervisor.objects.all()
 
     def update(self, request, *args, **kwargs):
-        try:
-            Supervisor.objects.get(user=self.request.user)
-            return super().update(request, *args, **kwargs)
-        except Supervisor.DoesNotExist:
+        if self.request.user.supervisor_id is None:
             return Response(
                 {"message": "You are not authorized to update this document"},
                 status=status.HTTP_403_FORBIDDEN,
             )
+        return super().update(request, *args, **kwargs)
 
 
 class Evaluation4CommitteeMemberView(RetrieveAPIView, UpdateAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = Evaluation4CommitteeMemberSerializer
     queryset = Evaluation4CommitteeMember.objects.all()
 
     def update(self, request, *args, **kwargs):
-        try:
-            CommitteeMember.objects.get(user=self.request.user)
-            return super().update(request, *args, **kwargs)
-        except CommitteeMember.DoesNotExist:
+        if self.request.user.committee_member_id is None:
             return Response(
                 {"message": "You are not authorized to update this document"},
                 status=status.HTTP_403_FORBIDDEN,
             )
+        return super().update(request, *args, **kwargs)
 
 
 class PanelAPIView(RetrieveAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = PanelSerializer
     queryset = CommitteeMemberPanel.objects.all()
 
 
 class CommitteeMemberPanelDetailAPIView(RetrieveAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = CommitteeMemberProfileSerializer
     queryset = CommitteeMember.objects.all()
 
 
-class ProjectDetailAPiView(RetrieveAPIView):
-    authentication_classes = [JWTAuthentication]
+class ProjectDetailAPiView(ExpandableQuerysetMixin, RetrieveAPIView):
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = ProjectSerializer
     queryset = Project.objects.all()
 
 
-class SupervisorStudentDetailAPIView(RetrieveAPIView):
-    authentication_classes = [JWTAuthentication]
+class SimilarProjectsAPIView(APIView):
+    """Existing projects whose text nearly duplicates the given project."""
+
+    authentication_classes = [ProfileJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        try:
+            project = Project.objects.get(pk=pk)
+        except Project.DoesNotExist:
+            return Response(
+                {"message": "Project not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        try:
+            threshold = float(request.GET.get("threshold", 0.5))
+        except ValueError:
+            return Response(
+                {"message": "threshold must be a number"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        matches = similar_projects(
+            project_text(project), threshold=threshold, exclude=project.pk
+        )
+        return Response(
+            [
+                {
+                    "project": ProjectSerializer(
+                        match, context={"request": request}
+                    ).data,
+                    "similarity": similarity,
+                }
+                for match, similarity in matches
+            ]
+        )
+
+
+class SupervisorRecommendationsAPIView(APIView):
+    """Supervisors with capacity left, best match for the project first."""
+
+    authentication_classes = [ProfileJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    max_limit = 50
+
+    def get(self, request, pk):
+        try:
+            project = Project.objects.get(pk=pk)
+        except Project.DoesNotExist:
+            return Response(
+                {"message": "Project not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        limit = request.GET.get("limit", "5")
+        if not limit.isdigit() or not 0 < int(limit) <= self.max_limit:
+            return Response(
+                {"message": f"limit must be between 1 and {self.max_limit}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        recommendations = recommend_supervisors(project_text(project), int(limit))
+        return Response(
+            [
+                {
+                    "supervisor": SupervisorDirectorySerializer(
+                        supervisor, context={"request": request}
+                    ).data,
+                    "score": score,
+                }
+                for supervisor, score in recommendations
+            ]
+        )
+
+
+class SupervisorStudentDetailAPIView(ExpandableQuerysetMixin, RetrieveAPIView):
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = SupervisorOfStudentGroupSerializer
     queryset = SupervisorOfStudentGroup.objects.all()
 
 
 class TemplateAPIView(ListAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = TemplateSerializer
     queryset = Template.objects.all()
@@ -954,10 +1164,11 @@ class TemplateAPIView(ListAPIView):
 
 
 class ChatRoomAPIView(CreateAPIView, ListAPIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
     serializer_class = ChatRoomSerializer
     queryset = ChatRoom.objects.all()
+    cursor_ordering = ("created_at", "id")
 
     def get_queryset(self):
         group_id = self.request.GET.get("group")
@@ -974,10 +1185,6 @@ class ChatRoomAPIView(CreateAPIView, ListAPIView):
         if not serializer.is_valid():
             return Response(serializer.errors, status=HTTP_400_BAD_REQUEST)
 
-        sent_by = None
-        student = None
-        supervisor = None
-
         try:
             group = SupervisorOfStudentGroup.objects.get(
                 id=serializer.validated_data["group"].id
@@ -987,28 +1194,19 @@ class ChatRoomAPIView(CreateAPIView, ListAPIView):
                 {"message": "Group not found"}, status=status.HTTP_404_NOT_FOUND
             )
 
-        try:
-            student = Student.objects.get(user=request.user)
-            sent_by = "student"
-        except Student.DoesNotExist:
-            pass
-
-        try:
-            supervisor = Supervisor.objects.get(user=request.user)
-            sent_by = "supervisor"
-        except Supervisor.DoesNotExist:
-            pass
-
-        if not student and not supervisor:
+        student_id = request.user.student_id
+        supervisor_id = request.user.supervisor_id
+        if not student_id and not supervisor_id:
             return Response(
                 {"message": "You are not part of this group."},
                 status=status.HTTP_403_FORBIDDEN,
             )
+        sent_by = "supervisor" if supervisor_id else "student"
 
         message = ChatRoom.objects.create(
             group=group,
-            student=student,
-            supervisor=supervisor,
+            student_id=student_id,
+            supervisor_id=supervisor_id,
             message=serializer.validated_data["message"],
             sent_by=sent_by,
         )
@@ -1019,13 +1217,12 @@ class ChatRoomAPIView(CreateAPIView, ListAPIView):
 
 
 class ExportReportAPIView(APIView):
-    authentication_classes = [JWTAuthentication]
+    authentication_classes = [ProfileJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get(self, request, *args, **kwargs):
-        try:
-            supervisor = Supervisor.objects.get(user=request.user)
-        except Supervisor.DoesNotExist:
+        supervisor = request.user.supervisor
+        if supervisor is None:
             return Response(
                 {"message": "User not found."},
                 status=status.HTTP_403_FORBIDDEN,
@@ -71,9 +71,9 @@ MIDDLEWARE = [
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "app.authentication.ProfileJWTAuthentication",
     ],
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "app.paginators.BasePagination",
     "PAGE_SIZE": 10,  # you can change the size
 }
 
@@ -178,6 +178,21 @@ SIMPLE_JWT = {
 }
 AUTH_USER_MODEL = "app.CustomUser"
 
+# In-process LRU of user id -> profile version used by the token fast path in
+# app.authentication; entries expire so version bumps in other workers are seen.
+# The fast path skips the user lookup, so a user deactivated or deleted through
+# another worker keeps authenticating there for up to this many seconds; the
+# worker that made the change forgets the entry at once
+PROFILE_VERSION_CACHE_SIZE = env.int("PROFILE_VERSION_CACHE_SIZE", default=10000)
+PROFILE_VERSION_CACHE_TTL = env.int("PROFILE_VERSION_CACHE_TTL", default=30)
+
+# Login pool (app.login_pool): password hashes are verified in this many worker
+# processes per web worker, with at most LOGIN_HASH_QUEUE_LIMIT more logins
+# waiting before the login views answer 503. 0 workers verifies inline.
+LOGIN_HASH_WORKERS = env.int("LOGIN_HASH_WORKERS", default=2)
+LOGIN_HASH_QUEUE_LIMIT = env.int("LOGIN_HASH_QUEUE_LIMIT", default=16)
+LOGIN_HASH_TIMEOUT = env.int("LOGIN_HASH_TIMEOUT", default=10)
+
 CORS_ALLOW_ALL_ORIGINS = env("CORS_ALLOW_ALL_ORIGINS")
 CORS_ALLOWED_ORIGINS = env("CORS_ALLOWED_ORIGINS")
 CSRF_TRUSTED_ORIGINS = env.list("CSRF_TRUSTED_ORIGINS", default=[])
@@ -195,3 +210,11 @@ CORS_ALLOW_HEADERS = [
 ]
 
 BASE_URL = "http://127.0.0.1:8000/"
+
+# Shared cache (e.g. redis:// or memcache://) so that invalidations reach every
+# worker; the per-process default only sees its own worker's invalidations
+CACHES = {"default": env.cache("CACHE_URL", default="locmemcache://")}
+
+# Seconds the project category catalog (app.catalog) stays cached; signals
+# invalidate it on change, the timeout bounds staleness with a per-process cache
+CATEGORY_CATALOG_CACHE_TTL = env.int("CATEGORY_CATALOG_CACHE_TTL", default=300)